@@ -0,0 +1,86 @@
+from src import logger
+from src.utils import save_metrics
+import json
+import subprocess
+import sys
+
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+REPEAT = 5
+
+# modules imported by each entry script and predictors it resolves through the registry.
+# Entry scripts run their experiments at import, so their imports are replayed instead.
+SCRIPTS = {
+    "validate_models.py": (
+        [
+            "src.dataset",
+            "src.dataset_loader",
+            "src.window",
+            "src.validate",
+            "src.predictors.registry",
+        ],
+        ["dbp", "kf"],
+    ),
+    "simulate_alg.py": (
+        [
+            "src.dataset",
+            "src.dataset_loader",
+            "src.window",
+            "src.techniques.dlbdc",
+            "src.techniques.dlds",
+            "src.predictors.registry",
+        ],
+        ["dbp-incremental", "kf"],
+    ),
+    "train_models.py": (
+        ["src.dataset", "src.dataset_loader", "src.training", "src.window"],
+        [],
+    ),
+}
+# dependencies imported at startup by every script before they were loaded lazily
+EAGER_MODULES = ["tensorflow", "sklearn.metrics", "filterpy.kalman"]
+HEAVY_MODULES = ["tensorflow", "sklearn", "filterpy"]
+
+_CODE = """
+import json, sys, time
+start = time.perf_counter()
+for module in {modules}:
+    __import__(module)
+from src.predictors.registry import get_predictor_class
+for name in {predictors}:
+    get_predictor_class(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"time": elapsed, "loaded": [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+_logger = logger.get_logger("benchmark_imports")
+
+
+def _import_time(modules: list[str], predictors: list[str]) -> tuple[float, list[str]]:
+    """
+    Returns the best import time (seconds) in a fresh interpreter and the heavy modules loaded.
+    """
+    code = _CODE.format(modules=modules, predictors=predictors, heavy=HEAVY_MODULES)
+    best = None
+    for _ in range(REPEAT):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = result["time"] if best is None else min(best, result["time"])
+    return best, result["loaded"]
+
+
+for script, (modules, predictors) in SCRIPTS.items():
+    eager_time, _ = _import_time(EAGER_MODULES + modules, predictors)
+    lazy_time, loaded = _import_time(modules, predictors)
+
+    metrics = {
+        "script": script,
+        "predictors": predictors,
+        "eager_s": eager_time,
+        "lazy_s": lazy_time,
+        "saving_s": eager_time - lazy_time,
+        "heavy_loaded": loaded,
+    }
+    _logger.info(f"{metrics}")
+    save_metrics("benchmark_imports.csv", OUTPUT_DIR, metrics)
@@ -0,0 +1,52 @@
+from src import logger
+from src.benchmark import time_calls
+from src.dataset import Dataset
+from src.dataset_loader import NoWeekLoader
+from src.predictors.ml_predictor import MLPredictor
+from src.utils import save_metrics
+from src.window import WindowConfig
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+MODELS = ["model1", "model2", "model3"]
+SEED = 69
+WS = 5
+TS = 1
+REPEAT = 500
+DATASET_NAME = ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader())
+
+_logger = logger.get_logger("benchmark_inference")
+
+ds = Dataset(
+    name=DATASET_NAME[0], base_path=DATASET_DIR, loader=DATASET_NAME[1], smooth=None
+)
+_, test_data = ds.train_test_split(type="random", seed=SEED)
+wc = WindowConfig(WS, TS)
+buffer = test_data[0, :WS].reshape((1, WS, 1)).copy()
+
+for model_name in MODELS:
+    predictor = MLPredictor(model_name, MODELS_DIR, ds.name(), wc, SEED)
+    model = predictor.model()
+
+    # single-window latency through `Model.predict` and through the fast path
+    before = time_calls(lambda: model.predict(buffer, verbose=0), repeat=REPEAT)
+    after = time_calls(lambda: predictor.predict(buffer), repeat=REPEAT)
+    _logger.info(f"{model_name}: predict={before} fast={after}")
+
+    save_metrics(
+        "benchmark_inference.csv",
+        OUTPUT_DIR,
+        {
+            "dataset": ds.name(),
+            "seed": SEED,
+            "model": model_name,
+            "window_size": WS,
+            "time_steps": TS,
+            "predict_us": before["mean_us"],
+            "fast_us": after["mean_us"],
+            "predict_p99_us": before["p99_us"],
+            "fast_p99_us": after["p99_us"],
+            "speedup": before["mean_us"] / after["mean_us"],
+        },
+    )
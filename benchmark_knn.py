@@ -0,0 +1,54 @@
+from src import logger
+from src.dataset import Dataset, to_supervised
+from src.dataset_loader import NoWeekLoader
+from src.utils import save_metrics
+from src.window import WindowConfig
+from src.predictors.knn_predictor import KNNPredictor
+import numpy as np
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+SEED = 69
+WINDOW_CONFIGS = [WindowConfig(5, 1), WindowConfig(5, 7), WindowConfig(20, 1)]
+K = [10, 30, 100]
+DATASET_NAMES = [
+    ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/pm2p5_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/rad_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/noise_peano_no_weekend.csv", NoWeekLoader()),
+]
+
+_logger = logger.get_logger("benchmark_knn")
+
+# compares the KNN predictor with the naive predictor repeating the last value of the window
+for dataset_name, dataset_loader in DATASET_NAMES:
+    ds = Dataset(
+        name=dataset_name, base_path=DATASET_DIR, loader=dataset_loader, smooth=None
+    )
+    _, test_data = ds.train_test_split(type="random", seed=SEED)
+    test_data = test_data.reshape((test_data.shape[0] * test_data.shape[1], 1))
+
+    for wc in WINDOW_CONFIGS:
+        x_test, y_test = to_supervised(test_data, wc)
+        y_test = y_test.reshape((y_test.shape[0], wc.ts))
+        naive_errors = np.abs(np.repeat(x_test[:, -1], wc.ts, axis=1) - y_test)
+
+        for k in K:
+            knn = KNNPredictor(wc, k=k).fit_dataset(ds, SEED)
+            knn_errors = np.abs(knn.predict(x_test) - y_test)
+
+            metrics = {
+                "dataset": ds.name(),
+                "seed": SEED,
+                "predictor_name": knn.name(),
+                "window_size": wc.ws,
+                "time_steps": wc.ts,
+                "naive_mae": float(np.mean(naive_errors)),
+                "knn_mae": float(np.mean(knn_errors)),
+                "naive_max_error": float(np.max(naive_errors)),
+                "knn_max_error": float(np.max(knn_errors)),
+            }
+            _logger.info(f"{metrics}")
+            if metrics["knn_mae"] > metrics["naive_mae"]:
+                _logger.warning(f"{knn.name()} is worse than the naive predictor")
+            save_metrics("benchmark_knn.csv", OUTPUT_DIR, metrics)
@@ -0,0 +1,83 @@
+from src import logger
+from src.dataset import Dataset
+from src.dataset_loader import NoWeekLoader
+from src.predictors.ml_predictor import MLPredictor
+from src.serving import PredictionClient, PredictionServer
+from src.utils import save_metrics
+from src.window import WindowConfig
+import asyncio
+import numpy as np
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+MODEL = "model3"
+SEED = 69
+WS = 5
+TS = 1
+NODES = [1, 10, 100, 500]
+REQUESTS_PER_NODE = 100
+MAX_BATCH = 256
+MAX_DELAY = 0.002
+DATASET_NAME = ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader())
+
+_logger = logger.get_logger("benchmark_serving")
+
+
+async def node(port: int, stream: np.ndarray) -> dict:
+    """
+    Simulated node predicting consecutive windows of its stream, one request at a time.
+    """
+    client = PredictionClient()
+    await client.connect(port=port)
+    for i in range(REQUESTS_PER_NODE):
+        await client.predict(stream[i : i + WS])
+    await client.close()
+    return client.stats()
+
+
+async def run(predictor, test_data: np.ndarray, nodes: int) -> dict:
+    server = PredictionServer(
+        predictor, WindowConfig(WS, TS), max_batch=MAX_BATCH, max_delay=MAX_DELAY
+    )
+    await server.start()
+    _, port = server.address()
+
+    # each node reads the test data starting from a different position
+    offsets = np.linspace(0, test_data.shape[0] - REQUESTS_PER_NODE - WS, nodes)
+    clients = await asyncio.gather(
+        *[node(port, test_data[int(offset) :]) for offset in offsets]
+    )
+    await server.close()
+
+    client_latencies = np.array([c["p99_us"] for c in clients])
+    stats = server.stats()
+    stats["client_p99_us"] = float(np.max(client_latencies))
+    return stats
+
+
+ds = Dataset(
+    name=DATASET_NAME[0], base_path=DATASET_DIR, loader=DATASET_NAME[1], smooth=None
+)
+_, test_data = ds.train_test_split(type="random", seed=SEED)
+test_data = test_data.reshape(-1)
+predictor = MLPredictor(MODEL, MODELS_DIR, ds.name(), WindowConfig(WS, TS), SEED)
+
+for nodes in NODES:
+    stats = asyncio.run(run(predictor, test_data, nodes))
+    _logger.info(f"{nodes=} {stats}")
+    save_metrics(
+        "benchmark_serving.csv",
+        OUTPUT_DIR,
+        {
+            "dataset": ds.name(),
+            "seed": SEED,
+            "predictor_name": predictor.name(),
+            "window_size": WS,
+            "time_steps": TS,
+            "nodes": nodes,
+            "max_batch": MAX_BATCH,
+            "max_delay": MAX_DELAY,
+            **stats,
+        },
+    )
@@ -0,0 +1,65 @@
+from src import logger
+from src.dataset import Dataset
+from src.dataset_loader import NoWeekLoader
+from src.predictors.numpy_predictor import NumpyMLPredictor
+from src.utils import save_metrics
+from src.window import WindowConfig
+import numpy as np
+import time
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+MODELS = ["model1", "model2", "model3"]
+SEED = 69
+WS = [5]  # [3, 5, 7, 10, 15]
+TS = 1
+DATASET_NAME = ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader())
+
+_logger = logger.get_logger("benchmark_streaming")
+
+ds = Dataset(
+    name=DATASET_NAME[0], base_path=DATASET_DIR, loader=DATASET_NAME[1], smooth=None
+)
+_, test_data = ds.train_test_split(type="random", seed=SEED)
+test_data = test_data.reshape(-1)
+
+for ws in WS:
+    wc = WindowConfig(ws, TS)
+    for model_name in MODELS:
+        full = NumpyMLPredictor(model_name, MODELS_DIR, ds.name(), wc, SEED)
+        streaming = NumpyMLPredictor(
+            model_name, MODELS_DIR, ds.name(), wc, SEED, streaming=True
+        )
+
+        # shift the window by one sample per step, as in the DLBDC simulation
+        full_time = 0.0
+        streaming_time = 0.0
+        max_diff = 0.0
+        buffer = test_data[:ws].reshape((1, ws, 1)).copy()
+        for idx in range(ws, test_data.shape[0]):
+            start = time.perf_counter()
+            y_full = full.predict(buffer)
+            full_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            y_streaming = streaming.predict(buffer)
+            streaming_time += time.perf_counter() - start
+
+            max_diff = max(max_diff, float(np.max(np.abs(y_full - y_streaming))))
+            buffer = np.roll(buffer, -1)
+            buffer[:, -1] = test_data[idx]
+
+        steps = test_data.shape[0] - ws
+        metrics = {
+            "dataset": ds.name(),
+            "seed": SEED,
+            "model": model_name,
+            "window_size": ws,
+            "time_steps": TS,
+            "full_us": full_time / steps * 1e6,
+            "streaming_us": streaming_time / steps * 1e6,
+            "max_abs_diff": max_diff,
+        }
+        _logger.info(f"{metrics}")
+        save_metrics("benchmark_streaming.csv", OUTPUT_DIR, metrics)
@@ -0,0 +1,99 @@
+from src import logger
+from src.benchmark import time_calls
+from src.dataset import Dataset
+from src.dataset_loader import NoWeekLoader
+from src.ml_model import get_model_path
+from src.predictors.ml_predictor import MLPredictor
+from src.predictors.tflite_predictor import TFLitePredictor
+from src.techniques import dlbdc
+from src.tflite_model import get_tflite_model_path
+from src.utils import save_metrics
+from src.window import WindowConfig
+import os
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+MODELS = ["model3"]
+QUANTIZATIONS = ["float32", "float16", "int8"]
+SEED = 69
+WS = 5
+TS = 1
+ERROR = 3
+DATASET_NAMES = [
+    ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/pm2p5_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/rad_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/noise_peano_no_weekend.csv", NoWeekLoader()),
+]
+
+_logger = logger.get_logger("benchmark_tflite")
+
+
+def path_size(path: str) -> int:
+    """
+    Returns the size in bytes of a file or of all the files inside a directory.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+wc = WindowConfig(WS, TS)
+for dataset_name, dataset_loader in DATASET_NAMES:
+    ds = Dataset(
+        name=dataset_name, base_path=DATASET_DIR, loader=dataset_loader, smooth=None
+    )
+    _, test_data = ds.train_test_split(type="random", seed=SEED)
+    buffer = test_data[0, :WS].reshape((1, WS, 1)).copy()
+
+    for model_name in MODELS:
+        predictors = [(MLPredictor(model_name, MODELS_DIR, ds.name(), wc, SEED), None)]
+        for quantization in QUANTIZATIONS:
+            predictors.append(
+                (
+                    TFLitePredictor(
+                        model_name, MODELS_DIR, ds.name(), wc, SEED, quantization
+                    ),
+                    quantization,
+                )
+            )
+
+        for predictor, quantization in predictors:
+            if quantization is None:
+                path = get_model_path(model_name, MODELS_DIR, ds.name(), wc, SEED)
+            else:
+                path = get_tflite_model_path(
+                    model_name, MODELS_DIR, ds.name(), wc, SEED, quantization
+                )
+            latency = time_calls(lambda: predictor.predict(buffer))
+            _logger.info(f"{predictor.name()}: size={path_size(path)} {latency=}")
+            save_metrics(
+                "benchmark_tflite.csv",
+                OUTPUT_DIR,
+                {
+                    "dataset": ds.name(),
+                    "seed": SEED,
+                    "predictor_name": predictor.name(),
+                    "window_size": WS,
+                    "time_steps": TS,
+                    "size_bytes": path_size(path),
+                    "latency_us": latency["mean_us"],
+                    "latency_p99_us": latency["p99_us"],
+                },
+            )
+
+            # skip rate and error of the quantized models are stored in simulate.csv
+            dlbdc.simulate(
+                dataset=ds,
+                output_path=OUTPUT_DIR,
+                predictor=predictor,
+                window_config=wc,
+                error=ERROR,
+                seed=SEED,
+                realign="simple-append",
+            )
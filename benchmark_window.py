@@ -0,0 +1,74 @@
+from src import logger
+from src.dataset import Dataset
+from src.dataset_loader import NoWeekLoader
+from src.utils import save_metrics
+from src.window import RingWindow
+import numpy as np
+import time
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+SEED = 69
+WS = [5, 20]  # [3, 5, 7, 10, 15]
+TS = [1, 7]
+DATASET_NAME = ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader())
+
+_logger = logger.get_logger("benchmark_window")
+
+
+def roll_steps(test_data: np.ndarray, ws: int, ts: int) -> tuple[float, float]:
+    """
+    Updates the window with `np.roll` as the simulations did, returns (seconds, checksum).
+    """
+    start = time.perf_counter()
+    checksum = 0.0
+    buffer = test_data[:ws].reshape((1, ws, 1)).copy()
+    for idx in range(ws, test_data.shape[0] - ts, ts):
+        checksum += buffer[0][0][0]
+        for i in range(ts):
+            buffer = np.roll(buffer, -1)
+            buffer[:, -1] = test_data[idx + i]
+    return time.perf_counter() - start, checksum
+
+
+def ring_steps(test_data: np.ndarray, ws: int, ts: int) -> tuple[float, float]:
+    """
+    Updates the window with a `RingWindow`, returns (seconds, checksum).
+    """
+    start = time.perf_counter()
+    checksum = 0.0
+    window = RingWindow(ws, dtype=test_data.dtype)
+    window.fill(test_data[:ws])
+    for idx in range(ws, test_data.shape[0] - ts, ts):
+        checksum += window.view()[0][0][0]
+        if ts == 1:
+            window.push(test_data[idx])
+        else:
+            window.push_many(test_data[idx : idx + ts])
+    return time.perf_counter() - start, checksum
+
+
+ds = Dataset(
+    name=DATASET_NAME[0], base_path=DATASET_DIR, loader=DATASET_NAME[1], smooth=None
+)
+_, test_data = ds.train_test_split(type="random", seed=SEED)
+test_data = test_data.reshape(-1)
+
+for ws in WS:
+    for ts in TS:
+        roll_time, roll_checksum = roll_steps(test_data, ws, ts)
+        ring_time, ring_checksum = ring_steps(test_data, ws, ts)
+        assert roll_checksum == ring_checksum
+
+        steps = len(range(ws, test_data.shape[0] - ts, ts))
+        metrics = {
+            "dataset": ds.name(),
+            "seed": SEED,
+            "window_size": ws,
+            "time_steps": ts,
+            "roll_steps_s": steps / roll_time,
+            "ring_steps_s": steps / ring_time,
+            "speedup": roll_time / ring_time,
+        }
+        _logger.info(f"{metrics}")
+        save_metrics("benchmark_window.csv", OUTPUT_DIR, metrics)
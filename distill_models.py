@@ -0,0 +1,63 @@
+from src.dataset import Dataset
+from src.dataset_loader import (
+    NoWeekLoader,
+    WeatherLoader,
+    TrafficLoader,
+    ElectricityLoader,
+)
+from src.training import distill_models
+from src.window import WindowConfig
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+TEACHER = "model3"
+ALPHA = 1.0
+STUDENTS_PARAM = {
+    "student_dense": {
+        "dense": 8,
+        "epochs": 100,
+        "batch_size": 32,
+    },
+    "student_lstm": {
+        "lstm_units": 4,
+        "epochs": 100,
+        "batch_size": 32,
+    },
+}
+SEEDS = [69]  # [42, 69, 911, 2020, 42069]
+WS = [5]  # [3, 5, 7, 10, 15, 40]
+TS = [1, 2]  # [2, 3, 5, 7, 10, 15]
+DATASET_NAMES = [
+    ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/pm2p5_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/rad_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/noise_peano_no_weekend.csv", NoWeekLoader()),
+    # ("external/weather.csv", WeatherLoader("T (degC)")),
+    # ("external/weather.csv", WeatherLoader("rh (%)")),
+    # ("external/weather.csv", WeatherLoader("wv (m/s)")),
+    # ("external/weather.csv", WeatherLoader("SWDR (W/m�)")),
+    # ("external/traffic.csv", TrafficLoader()),
+    # ("external/electricity.csv", ElectricityLoader()),
+]
+
+for dataset_name, dataset_loader in DATASET_NAMES:
+    ds = Dataset(
+        name=dataset_name,
+        base_path=DATASET_DIR,
+        loader=dataset_loader,
+        smooth=None,
+    )
+    for seed in SEEDS:
+        for ws in WS:
+            for ts in TS:
+                distill_models(
+                    dataset=ds,
+                    window_config=WindowConfig(ws, ts),
+                    models_path=MODELS_DIR,
+                    output_path=OUTPUT_DIR,
+                    seed=seed,
+                    teacher_name=TEACHER,
+                    params=STUDENTS_PARAM,
+                    alpha=ALPHA,
+                )
@@ -0,0 +1,56 @@
+from src.dataset import Dataset
+from src.dataset_loader import (
+    NoWeekLoader,
+    WeatherLoader,
+    TrafficLoader,
+    ElectricityLoader,
+)
+from src.numpy_model import export_numpy_model
+from src.tflite_model import export_tflite_model
+from src.window import WindowConfig
+
+DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
+MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
+OUTPUT_DIR = "/home/l.calisti/notebooks/dlds_paper/outputs"
+MODELS = ["model1", "model2", "model3"]
+SEEDS = [69]  # [42, 69, 911, 2020, 42069]
+WS = [5]  # [3, 5, 7, 10, 15]
+TS = [1, 2]
+QUANTIZATIONS = ["float32", "float16", "int8"]
+DATASET_NAMES = [
+    ("noweekend/co2_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/pm2p5_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/rad_peano_no_weekend.csv", NoWeekLoader()),
+    ("noweekend/noise_peano_no_weekend.csv", NoWeekLoader()),
+    # ("external/weather.csv", WeatherLoader("T (degC)")),
+    # ("external/weather.csv", WeatherLoader("rh (%)")),
+    # ("external/weather.csv", WeatherLoader("wv (m/s)")),
+    # ("external/weather.csv", WeatherLoader("SWDR (W/m�)")),
+    # ("external/traffic.csv", TrafficLoader()),
+    # ("external/electricity.csv", ElectricityLoader()),
+]
+
+for dataset_name, dataset_loader in DATASET_NAMES:
+    ds = Dataset(
+        name=dataset_name, base_path=DATASET_DIR, loader=dataset_loader, smooth=None
+    )
+    for seed in SEEDS:
+        for ws in WS:
+            for ts in TS:
+                for model_name in MODELS:
+                    export_numpy_model(
+                        model_name=model_name,
+                        models_path=MODELS_DIR,
+                        dataset_name=ds.name(),
+                        window_config=WindowConfig(ws, ts),
+                        seed=seed,
+                    )
+                    for quantization in QUANTIZATIONS:
+                        export_tflite_model(
+                            model_name=model_name,
+                            models_path=MODELS_DIR,
+                            dataset=ds,
+                            window_config=WindowConfig(ws, ts),
+                            seed=seed,
+                            quantization=quantization,
+                        )
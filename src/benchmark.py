@@ -0,0 +1,31 @@
+import time
+import numpy as np
+
+
+def time_calls(fn, repeat: int = 200, warmup: int = 10) -> dict:
+    """
+    Measures the latency of repeated calls to a function.
+
+    Parameters:
+        fn (callable): Function without arguments to benchmark.
+        repeat (int, optional): Number of timed calls. Default is 200.
+        warmup (int, optional): Number of untimed calls made before measuring (e.g. tracing). Default is 10.
+
+    Returns:
+        dict: Mean, median and 99th percentile of the call latency in microseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = np.zeros(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    times *= 1e6
+
+    return {
+        "mean_us": float(np.mean(times)),
+        "p50_us": float(np.percentile(times, 50)),
+        "p99_us": float(np.percentile(times, 99)),
+    }
@@ -1,9 +1,12 @@
 from . import logger
 from .window import WindowConfig
 from os.path import join
-from tensorflow import keras
+from typing import TYPE_CHECKING
 import numpy as np
 
+if TYPE_CHECKING:
+    from tensorflow import keras
+
 _logger = logger.get_logger(__name__)
 
 
@@ -38,7 +41,7 @@ def get_model_path(
 
 def build_model(
     model_name: str, params: dict, window_config: WindowConfig, adapt_data: np.ndarray
-) -> keras.Model:
+) -> "keras.Model":
     """
     Builds and returns a Keras model based on the specified model name and parameters.
 
@@ -55,6 +58,9 @@ def build_model(
         Exception: If the provided `model_name` is not supported.
         AssertionError: If required parameters are missing in `params`.
     """
+    # imported here so that model paths can be resolved without loading tensorflow
+    from tensorflow import keras
+
     match model_name:
         case "model1":
             assert "lstm_units" in params
@@ -155,6 +161,37 @@ def build_model(
             model.add(keras.layers.Dense(params["dense"], activation="linear"))
             model.add(keras.layers.Dense(window_config.ts))
             return model
+        case "student_dense":
+            assert "dense" in params
+
+            # create normalization layer
+            normalization_layer = keras.layers.Normalization()
+            normalization_layer.adapt(adapt_data)
+
+            model = keras.Sequential()
+            model.add(keras.layers.InputLayer((window_config.ws, 1)))
+            model.add(normalization_layer)
+            model.add(keras.layers.Flatten())
+            model.add(keras.layers.Dense(params["dense"], activation="linear"))
+            model.add(keras.layers.Dense(window_config.ts, "linear"))
+            return model
+        case "student_lstm":
+            assert "lstm_units" in params
+
+            # create normalization layer
+            normalization_layer = keras.layers.Normalization()
+            normalization_layer.adapt(adapt_data)
+
+            model = keras.Sequential()
+            model.add(keras.layers.InputLayer((window_config.ws, 1)))
+            model.add(normalization_layer)
+            model.add(
+                keras.layers.LSTM(
+                    params["lstm_units"], activation="linear", return_sequences=False
+                )
+            )
+            model.add(keras.layers.Dense(window_config.ts, "linear"))
+            return model
         case _:
             _logger.fatal(f"unsupported model '{model_name}'")
             raise Exception(f"unsupported model '{model_name}'")
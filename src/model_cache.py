@@ -0,0 +1,138 @@
+from . import logger
+from collections import OrderedDict
+from dataclasses import dataclass
+import os
+import time
+
+_logger = logger.get_logger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters collected by an in-memory cache (e.g. `ModelCache`).
+
+    Attributes:
+        hits (int): Number of lookups served from memory.
+        misses (int): Number of lookups that required computing or loading the value.
+        evictions (int): Number of entries dropped to respect the cache size.
+        miss_time (float): Total time (seconds) spent computing or loading the values of the misses.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    miss_time: float = 0.0
+
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups served from memory.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class ModelCache:
+    """
+    In-process LRU cache of loaded models.
+
+    Models are keyed by their resolved path and modification time, so a model
+    overwritten on disk (e.g. by a new training run) is loaded again instead of
+    being served stale.
+    """
+
+    def __init__(self, max_size: int = 8, loader=None):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            max_size (int, optional): Maximum number of models kept in memory. Default is 8.
+            loader (callable, optional): Function loading a model from a path. Default is `keras.models.load_model`.
+        """
+        assert max_size > 0
+
+        self._max_size = max_size
+        self._loader = loader
+        self._models = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __repr__(self):
+        return f"ModelCache(size={len(self)}, max_size={self._max_size}, stats={self.stats})"
+
+    def get(self, path: str):
+        """
+        Returns the model stored at `path`, loading it from disk on a cache miss.
+
+        Parameters:
+            path (str): Path of the saved model (file or directory).
+
+        Returns:
+            The loaded model.
+        """
+        key = _cache_key(path)
+        if key in self._models:
+            self.stats.hits += 1
+            self._models.move_to_end(key)
+            return self._models[key]
+
+        self.stats.misses += 1
+        start = time.perf_counter()
+        model = self._load(key[0])
+        elapsed = time.perf_counter() - start
+        self.stats.miss_time += elapsed
+        _logger.debug(f"loaded model '{key[0]}' in {elapsed:.3f}s")
+
+        # drop older versions of the same model
+        for old_key in [k for k in self._models if k[0] == key[0]]:
+            del self._models[old_key]
+
+        self._models[key] = model
+        while len(self._models) > self._max_size:
+            old_key, _ = self._models.popitem(last=False)
+            self.stats.evictions += 1
+            _logger.debug(f"evict model '{old_key[0]}'")
+
+        return model
+
+    def clear(self):
+        """
+        Removes all the models from the cache. Statistics are preserved.
+        """
+        self._models.clear()
+
+    def _load(self, path: str):
+        if self._loader is not None:
+            return self._loader(path)
+
+        from tensorflow import keras
+
+        return keras.models.load_model(path)
+
+
+def _cache_key(path: str) -> tuple[str, float]:
+    """
+    Returns the cache key of a model as (resolved path, modification time).
+
+    Keras saves models either as a single file or as a directory (SavedModel),
+    in the latter case the newest modification time of its top-level entries is used.
+    """
+    real_path = os.path.realpath(path)
+    mtime = os.path.getmtime(real_path)
+    if os.path.isdir(real_path):
+        with os.scandir(real_path) as entries:
+            for entry in entries:
+                mtime = max(mtime, entry.stat().st_mtime)
+    return (real_path, mtime)
+
+
+_default_cache = ModelCache()
+
+
+def get_default_cache() -> ModelCache:
+    """
+    Returns the process-wide model cache shared by all the `MLPredictor` instances.
+    """
+    return _default_cache
@@ -0,0 +1,104 @@
+from . import logger
+from .predictors.predictor import BasePredictor
+from .window import WindowConfig
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+
+class MultiStreamPredictor:
+    """
+    Front end serving many independent sensor streams with a single predictor.
+
+    The windows of all the streams are stored in one (S, ws, 1) array and advanced in
+    lockstep, so each tick costs a single `predict` call for all the streams instead of
+    one call per stream. Only stateless predictors can be shared between streams.
+    """
+
+    def __init__(
+        self,
+        predictor: BasePredictor,
+        window_config: WindowConfig,
+        initial_windows: np.ndarray,
+    ):
+        """
+        Initializes the streams with their first window of values.
+
+        Parameters:
+            predictor (BasePredictor): Stateless predictor shared by all the streams.
+            window_config (WindowConfig): Window configuration parameters.
+            initial_windows (np.ndarray): First window of each stream, with shape (S, ws) or (S, ws, 1).
+
+        Raises:
+            Exception: If the predictor is stateful or the windows have the wrong size.
+        """
+        if predictor.get_state() is not None:
+            _logger.fatal(f"cannot share stateful predictor '{predictor.name()}'")
+            raise Exception(f"cannot share stateful predictor '{predictor.name()}'")
+        if initial_windows.shape[1] != window_config.ws:
+            _logger.fatal(
+                f"expected windows of size {window_config.ws} but got {initial_windows.shape[1]}"
+            )
+            raise Exception(
+                f"expected windows of size {window_config.ws} but got {initial_windows.shape[1]}"
+            )
+
+        self._predictor = predictor
+        self._window_config = window_config
+        self._buffers = (
+            np.asarray(initial_windows, dtype=np.float64)
+            .reshape((initial_windows.shape[0], window_config.ws, 1))
+            .copy()
+        )
+
+    def streams(self) -> int:
+        """
+        Returns the number of streams.
+        """
+        return self._buffers.shape[0]
+
+    def buffers(self) -> np.ndarray:
+        """
+        Returns the windows of all the streams as a (S, ws, 1) array.
+        """
+        return self._buffers
+
+    def predict(self) -> np.ndarray:
+        """
+        Predicts the next values of all the streams with a single call to the predictor.
+
+        Returns:
+            np.ndarray: Predictions as a 2-D array with shape (S, ts).
+        """
+        return self._predictor.predict(self._buffers)
+
+    def push(self, values: np.ndarray):
+        """
+        Appends one value to the window of each stream, dropping the oldest one.
+
+        Parameters:
+            values (np.ndarray): The new value of each stream, with shape (S,).
+        """
+        self._buffers[:, :-1] = self._buffers[:, 1:]
+        self._buffers[:, -1, 0] = values
+
+    def step(self, y_real: np.ndarray, error: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Runs one tick of the DLBDC technique for all the streams.
+
+        Each stream skips sending its real value when the prediction is within the
+        allowed relative error, and appends either the prediction (skip) or the real
+        value (send) to its window.
+
+        Parameters:
+            y_real (np.ndarray): Real value read by each stream, with shape (S,).
+            error (float): Allowed relative error (percentage).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The (S,) boolean mask of the skipped streams and the (S,) predictions.
+        """
+        y_pred = self.predict()[:, 0]
+        eps = (y_real * error) / 100
+        skip = (y_pred >= (y_real - eps)) & (y_pred <= (y_real + eps))
+        self.push(np.where(skip, y_pred, y_real))
+        return skip, y_pred
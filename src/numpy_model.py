@@ -0,0 +1,511 @@
+from . import logger
+from .ml_model import get_model_path
+from .model_cache import ModelCache, get_default_cache
+from .window import WindowConfig
+import json
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+# epsilon used by keras to bound the standard deviation of the Normalization layer
+_KERAS_EPSILON = 1e-7
+
+
+def get_numpy_model_path(
+    model_name: str,
+    model_path: str,
+    dataset_name: str,
+    window_config: WindowConfig,
+    seed: int,
+) -> str:
+    """
+    Returns the path of the NumPy export of a model, stored next to the Keras model.
+
+    Parameters:
+        model_name (str): Name of the model architecture.
+        model_path (str): Base path where models are stored.
+        dataset_name (str): Name of the dataset used for training.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used for reproducibility.
+
+    Returns:
+        str: The path of the `.npz` file.
+    """
+    return (
+        get_model_path(model_name, model_path, dataset_name, window_config, seed)
+        + ".npz"
+    )
+
+
+def _sigmoid(x):
+    # equivalent to 1 / (1 + exp(-x)) without overflowing for large negative inputs
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+}
+
+
+def _activation(name: str):
+    if name not in _ACTIVATIONS:
+        _logger.fatal(f"unsupported activation '{name}'")
+        raise Exception(f"unsupported activation '{name}'")
+    return _ACTIVATIONS[name]
+
+
+def _normalization(x, config, weights):
+    std = np.maximum(np.sqrt(weights["variance"]), _KERAS_EPSILON)
+    return (x - weights["mean"]) / std
+
+
+def _dense(x, config, weights):
+    y = x @ weights["kernel"]
+    if "bias" in weights:
+        y = y + weights["bias"]
+    return _activation(config["activation"])(y)
+
+
+def _lstm(x, config, weights):
+    units = config["units"]
+    act = _activation(config["activation"])
+    rec_act = _activation(config["recurrent_activation"])
+
+    # the input contribution of every time step is computed at once
+    z_x = x @ weights["kernel"]
+    if "bias" in weights:
+        z_x = z_x + weights["bias"]
+    hs = _lstm_recurrence(z_x, weights["recurrent_kernel"], units, act, rec_act)
+    return hs.transpose((1, 0, 2)) if config["return_sequences"] else hs[-1]
+
+
+def _lstm_recurrence(z_x, recurrent_kernel, units, act, rec_act):
+    """
+    Runs the LSTM recurrence over precomputed input projections `z_x` with shape (B, T, 4*units).
+
+    Returns:
+        np.ndarray: The hidden states of every time step with shape (T, B, units).
+    """
+    batch, steps, _ = z_x.shape
+    h = np.zeros((batch, units), dtype=z_x.dtype)
+    c = np.zeros((batch, units), dtype=z_x.dtype)
+    hs = np.empty((steps, batch, units), dtype=z_x.dtype)
+    for t in range(steps):
+        z = z_x[:, t] + h @ recurrent_kernel
+        # gates are stored in the keras order: input, forget, cell, output
+        gates = rec_act(z)
+        g = act(z[:, 2 * units : 3 * units])
+        c = gates[:, units : 2 * units] * c + gates[:, :units] * g
+        h = gates[:, 3 * units :] * act(c)
+        hs[t] = h
+    return hs
+
+
+def _conv1d(x, config, weights):
+    kernel = weights["kernel"]
+    k = kernel.shape[0]
+    dilation = config["dilation_rate"]
+    stride = config["strides"]
+    span = (k - 1) * dilation
+
+    match config["padding"]:
+        case "causal":
+            x = np.pad(x, ((0, 0), (span, 0), (0, 0)))
+        case "same":
+            x = np.pad(x, ((0, 0), (span // 2, span - span // 2), (0, 0)))
+        case "valid":
+            pass
+        case _:
+            _logger.fatal(f"unsupported padding '{config['padding']}'")
+            raise Exception(f"unsupported padding '{config['padding']}'")
+
+    steps = (x.shape[1] - span - 1) // stride + 1
+    y = np.zeros((x.shape[0], steps, kernel.shape[2]), dtype=x.dtype)
+    for j in range(k):
+        start = j * dilation
+        y += x[:, start : start + (steps - 1) * stride + 1 : stride] @ kernel[j]
+    if "bias" in weights:
+        y += weights["bias"]
+    return _activation(config["activation"])(y)
+
+
+def _max_pooling1d(x, config, weights):
+    pool = config["pool_size"]
+    stride = config["strides"]
+    steps = (x.shape[1] - pool) // stride + 1
+    y = x[:, : (steps - 1) * stride + 1 : stride]
+    for j in range(1, pool):
+        y = np.maximum(y, x[:, j : j + (steps - 1) * stride + 1 : stride])
+    return y
+
+
+def _flatten(x, config, weights):
+    return x.reshape((x.shape[0], -1))
+
+
+def _repeat_vector(x, config, weights):
+    return np.repeat(x[:, np.newaxis, :], config["n"], axis=1)
+
+
+_LAYERS = {
+    "normalization": _normalization,
+    "dense": _dense,
+    "lstm": _lstm,
+    "conv1d": _conv1d,
+    "max_pooling1d": _max_pooling1d,
+    "flatten": _flatten,
+    "repeat_vector": _repeat_vector,
+}
+
+
+class NumpyModel:
+    """
+    Inference-only NumPy implementation of the architectures built by `ml_model.build_model`.
+
+    The model is a sequence of layers, each one described by its type, a configuration
+    dictionary and its weights. It can be exported from a Keras model and stored into a
+    compact `.npz` file, that is loaded back without importing TensorFlow.
+    """
+
+    def __init__(self, layers: list[tuple[str, dict, dict]], dtype=np.float32):
+        """
+        Initializes the model from its layers.
+
+        Parameters:
+            layers (list): List of (type, config, weights) tuples, in order of execution.
+            dtype (optional): Floating point type used for the computation. Default is float32, like Keras.
+        """
+        self._dtype = dtype
+        self.layers = []
+        for kind, config, weights in layers:
+            if kind not in _LAYERS:
+                _logger.fatal(f"unsupported layer '{kind}'")
+                raise Exception(f"unsupported layer '{kind}'")
+            weights = {k: np.asarray(w, dtype=dtype) for k, w in weights.items()}
+            self.layers.append((kind, config, weights))
+        self._forward = [(_LAYERS[kind], c, w) for kind, c, w in self.layers]
+
+    def __repr__(self):
+        return f"NumpyModel(layers={[kind for kind, _, _ in self.layers]})"
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        Runs the model on a batch of inputs.
+
+        Parameters:
+            x (np.ndarray): Input data as 3-D array with shape (N, ws, 1).
+
+        Returns:
+            np.ndarray: The output of the last layer.
+        """
+        return self.run_from(np.asarray(x, dtype=self._dtype), 0)
+
+    def run_from(self, y: np.ndarray, start: int) -> np.ndarray:
+        """
+        Runs the layers starting from the one at index `start` on an intermediate output.
+
+        Parameters:
+            y (np.ndarray): Output of the layer at index `start - 1`.
+            start (int): Index of the first layer to run.
+
+        Returns:
+            np.ndarray: The output of the last layer.
+        """
+        for fn, config, weights in self._forward[start:]:
+            y = fn(y, config, weights)
+        return y
+
+    def save(self, path: str):
+        """
+        Stores the model into a `.npz` file.
+
+        Parameters:
+            path (str): Path of the output file.
+        """
+        arrays = {}
+        for i, (_, _, weights) in enumerate(self.layers):
+            for name, w in weights.items():
+                arrays[f"{i}.{name}"] = w
+        config = [[kind, config] for kind, config, _ in self.layers]
+        np.savez(path, __config__=np.array(json.dumps(config)), **arrays)
+        _logger.debug(f"saved numpy model into '{path}'")
+
+    @classmethod
+    def load(cls, path: str, dtype=np.float32) -> "NumpyModel":
+        """
+        Loads a model stored with `save`.
+
+        Parameters:
+            path (str): Path of the `.npz` file.
+            dtype (optional): Floating point type used for the computation. Default is float32.
+
+        Returns:
+            NumpyModel: The loaded model.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["__config__"]))
+            layers = []
+            for i, (kind, layer_config) in enumerate(config):
+                prefix = f"{i}."
+                weights = {
+                    k[len(prefix) :]: data[k]
+                    for k in data.files
+                    if k.startswith(prefix)
+                }
+                layers.append((kind, layer_config, weights))
+        return cls(layers, dtype=dtype)
+
+    @classmethod
+    def from_keras(cls, model, dtype=np.float32) -> "NumpyModel":
+        """
+        Exports the weights of a Keras sequential model.
+
+        Parameters:
+            model (keras.Model): The Keras model to export.
+            dtype (optional): Floating point type used for the computation. Default is float32.
+
+        Returns:
+            NumpyModel: The exported model.
+
+        Raises:
+            Exception: If the model contains an unsupported layer or option.
+        """
+        layers = []
+        for layer in model.layers:
+            exported = _export_layer(layer)
+            if exported is not None:
+                layers.append(exported)
+        return cls(layers, dtype=dtype)
+
+
+class StreamingNumpyModel:
+    """
+    Streaming wrapper of a `NumpyModel` for single windows shifted by one sample per step.
+
+    The LSTM state at the end of a window depends on the whole window through the
+    sigmoid gates, so it cannot be updated exactly from the previous window's state.
+    What only depends on a single sample is the normalized input projection of the
+    first LSTM layer: this wrapper keeps the projections of every window position
+    and, when the new window is the previous one shifted by one sample, it rolls
+    them and computes only the projection of the new sample. Any other window is
+    recomputed from scratch.
+
+    Models that do not start with an (optionally normalized) LSTM layer always run
+    the full forward pass.
+    """
+
+    def __init__(self, model: NumpyModel):
+        """
+        Initializes the streaming wrapper.
+
+        Parameters:
+            model (NumpyModel): The model to run.
+        """
+        self._model = model
+
+        kinds = [kind for kind, _, _ in model.layers]
+        lstm_idx = 1 if kinds[:1] == ["normalization"] else 0
+        self.streamable = kinds[lstm_idx : lstm_idx + 1] == ["lstm"]
+        if not self.streamable:
+            _logger.debug(f"model {kinds} cannot be streamed")
+            return
+
+        if lstm_idx == 1:
+            norm = model.layers[0][2]
+            self._mean = norm["mean"].reshape(-1)[0]
+            self._std = np.maximum(np.sqrt(norm["variance"]), _KERAS_EPSILON).reshape(
+                -1
+            )[0]
+        else:
+            self._mean = model._dtype(0)
+            self._std = model._dtype(1)
+
+        _, self._config, weights = model.layers[lstm_idx]
+        self._kernel = weights["kernel"]
+        self._bias = weights.get("bias", np.zeros(self._kernel.shape[1], model._dtype))
+        self._recurrent_kernel = weights["recurrent_kernel"]
+        self._act = _activation(self._config["activation"])
+        self._rec_act = _activation(self._config["recurrent_activation"])
+        self._next_layer = lstm_idx + 1
+
+        self._window = None
+        self._proj = None
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        Runs the model on a batch of inputs, reusing the cached projections for single windows.
+
+        Parameters:
+            x (np.ndarray): Input data as 3-D array with shape (N, ws, 1).
+
+        Returns:
+            np.ndarray: The output of the last layer.
+        """
+        if not self.streamable or x.shape[0] != 1:
+            return self._model(x)
+
+        window = np.asarray(x[0, :, 0], dtype=self._model._dtype)
+        if self._window is None or self._window.shape != window.shape:
+            self._window = window.copy()
+            self._proj = self._project(window)
+        elif np.array_equal(window[:-1], self._window[1:]):
+            # shifted by one sample: fuse the roll with the projection of the new sample
+            self._window[:-1] = self._window[1:]
+            self._window[-1] = window[-1]
+            self._proj[:-1] = self._proj[1:]
+            self._proj[-1] = self._project(window[-1:])[0]
+        elif not np.array_equal(window, self._window):
+            self._window[:] = window
+            self._proj = self._project(window)
+
+        hs = _lstm_recurrence(
+            self._proj[np.newaxis],
+            self._recurrent_kernel,
+            self._config["units"],
+            self._act,
+            self._rec_act,
+        )
+        y = hs.transpose((1, 0, 2)) if self._config["return_sequences"] else hs[-1]
+        return self._model.run_from(y, self._next_layer)
+
+    def reset(self):
+        """
+        Drops the cached window.
+        """
+        self._window = None
+        self._proj = None
+
+    def _project(self, values: np.ndarray) -> np.ndarray:
+        normalized = (values[:, np.newaxis] - self._mean) / self._std
+        return normalized @ self._kernel + self._bias
+
+
+def _export_layer(layer) -> tuple[str, dict, dict]:
+    """
+    Converts a Keras layer into a (type, config, weights) tuple, or None for layers without effect at inference.
+    """
+    kind = layer.__class__.__name__
+    config = layer.get_config()
+
+    def unsupported(reason):
+        _logger.fatal(f"cannot export layer '{layer.name}': {reason}")
+        raise Exception(f"cannot export layer '{layer.name}': {reason}")
+
+    def activation(name):
+        # keras stores activations either as names or as serialized objects
+        return name if isinstance(name, str) else name.get("config", name)
+
+    match kind:
+        case "InputLayer" | "Dropout":
+            return None
+        case "Normalization":
+            if config.get("invert", False):
+                unsupported("inverted normalization")
+            return (
+                "normalization",
+                {},
+                {"mean": np.array(layer.mean), "variance": np.array(layer.variance)},
+            )
+        case "Dense":
+            names = ["kernel", "bias"] if config["use_bias"] else ["kernel"]
+            return (
+                "dense",
+                {"activation": activation(config["activation"])},
+                dict(zip(names, layer.get_weights())),
+            )
+        case "LSTM":
+            if config.get("go_backwards", False) or config.get("stateful", False):
+                unsupported("backward or stateful LSTM")
+            names = ["kernel", "recurrent_kernel"]
+            if config["use_bias"]:
+                names.append("bias")
+            return (
+                "lstm",
+                {
+                    "units": config["units"],
+                    "activation": activation(config["activation"]),
+                    "recurrent_activation": activation(config["recurrent_activation"]),
+                    "return_sequences": config["return_sequences"],
+                },
+                dict(zip(names, layer.get_weights())),
+            )
+        case "Conv1D":
+            if config["groups"] != 1:
+                unsupported("grouped convolution")
+            names = ["kernel", "bias"] if config["use_bias"] else ["kernel"]
+            return (
+                "conv1d",
+                {
+                    "padding": config["padding"],
+                    "strides": _single(config["strides"]),
+                    "dilation_rate": _single(config["dilation_rate"]),
+                    "activation": activation(config["activation"]),
+                },
+                dict(zip(names, layer.get_weights())),
+            )
+        case "MaxPooling1D":
+            if config["padding"] != "valid":
+                unsupported(f"padding '{config['padding']}'")
+            pool = _single(config["pool_size"])
+            strides = config["strides"]
+            return (
+                "max_pooling1d",
+                {
+                    "pool_size": pool,
+                    "strides": pool if strides is None else _single(strides),
+                },
+                {},
+            )
+        case "Flatten":
+            return ("flatten", {}, {})
+        case "RepeatVector":
+            return ("repeat_vector", {"n": config["n"]}, {})
+        case "TimeDistributed":
+            # a dense layer applied on the last axis is already time distributed
+            if layer.layer.__class__.__name__ != "Dense":
+                unsupported("only Dense layers can be time distributed")
+            return _export_layer(layer.layer)
+        case _:
+            unsupported(f"unsupported layer type '{kind}'")
+
+
+def _single(value) -> int:
+    return value[0] if isinstance(value, (list, tuple)) else value
+
+
+def export_numpy_model(
+    model_name: str,
+    models_path: str,
+    dataset_name: str,
+    window_config: WindowConfig,
+    seed: int,
+    cache: ModelCache = None,
+) -> str:
+    """
+    Exports a trained Keras model into a NumPy model stored next to it.
+
+    Parameters:
+        model_name (str): Name of the model architecture.
+        models_path (str): Base path where models are stored.
+        dataset_name (str): Name of the dataset used for training.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used for reproducibility.
+        cache (ModelCache, optional): Cache used to load the Keras model. Default is the process-wide cache.
+
+    Returns:
+        str: The path of the exported model.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    model_path = get_model_path(
+        model_name, models_path, dataset_name, window_config, seed
+    )
+    out_path = get_numpy_model_path(
+        model_name, models_path, dataset_name, window_config, seed
+    )
+
+    _logger.debug(f"export model '{model_path}' into '{out_path}'")
+    NumpyModel.from_keras(cache.get(model_path)).save(out_path)
+    return out_path
@@ -0,0 +1,90 @@
+from .. import logger
+from .predictor import BasePredictor
+from ..dataset import Dataset, to_supervised
+from ..window import WindowConfig
+import numpy as np
+
+
+class ARPredictor(BasePredictor):
+    """
+    Autoregressive predictor fitted with a multi-output ridge regression.
+
+    The next `ts` values are a linear combination of the `ws` values of the window plus
+    an intercept. The weights of all the outputs are found in closed form by solving the
+    normal equations once, so fitting takes milliseconds and predicting a batch of any
+    size is a single matrix product.
+    """
+
+    def __init__(self, window_config: WindowConfig, l2: float = 1e-3):
+        """
+        Initializes an unfitted predictor.
+
+        Parameters:
+            window_config (WindowConfig): Window configuration parameters.
+            l2 (float, optional): Ridge regularization of the weights, the intercept is not regularized. Default is 1e-3.
+        """
+        super().__init__()
+        self._logger = logger.get_logger(self.__class__.__name__)
+
+        assert l2 >= 0.0
+
+        self._window_config = window_config
+        self._l2 = l2
+        self._weights = None
+        self._intercept = None
+
+    def name(self) -> str:
+        return "AR"
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "ARPredictor":
+        """
+        Fits the weights on supervised windows, as returned by `to_supervised`.
+
+        Parameters:
+            x (np.ndarray): Input windows with shape (N, ws, 1).
+            y (np.ndarray): Targets with shape (N, ts).
+
+        Returns:
+            ARPredictor: The fitted predictor.
+        """
+        x = x.reshape((x.shape[0], self._window_config.ws)).astype(np.float64)
+        y = y.reshape((y.shape[0], self._window_config.ts)).astype(np.float64)
+
+        # center the data so that the intercept is not regularized
+        x_mean = x.mean(axis=0)
+        y_mean = y.mean(axis=0)
+        xc = x - x_mean
+        yc = y - y_mean
+
+        gram = xc.T @ xc
+        gram[np.diag_indices_from(gram)] += self._l2
+        self._weights = np.linalg.solve(gram, xc.T @ yc)
+        self._intercept = y_mean - x_mean @ self._weights
+        self._logger.debug(f"fitted on {x.shape[0]} windows")
+        return self
+
+    def fit_dataset(self, dataset: Dataset, seed: int) -> "ARPredictor":
+        """
+        Fits the weights on the training split of a dataset, the same used to train the ML models.
+
+        Parameters:
+            dataset (Dataset): The dataset to train on.
+            seed (int): Random seed used to split the dataset.
+
+        Returns:
+            ARPredictor: The fitted predictor.
+        """
+        train_data, _ = dataset.train_test_split(type="random", seed=seed)
+        train_data = train_data.reshape((train_data.shape[0] * train_data.shape[1], 1))
+        x_train, y_train = to_supervised(train_data, self._window_config)
+        return self.fit(x_train, y_train)
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        assert self._weights is not None, "predictor must be fitted before predicting"
+        return (
+            x.reshape((x.shape[0], self._window_config.ws)) @ self._weights
+            + self._intercept
+        )
+
+    def update(self, sample):
+        return None
@@ -0,0 +1,130 @@
+from .. import logger
+from .predictor import BasePredictor
+from ..model_cache import CacheStats
+from collections import OrderedDict
+import time
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+
+class CachedPredictor(BasePredictor):
+    """
+    Wrapper memoizing the predictions of a stateless predictor.
+
+    Windows are quantized to a fixed resolution and used as keys of a bounded LRU cache,
+    so nearly identical windows (e.g. long flat periods of a series) are served without
+    calling the inner predictor. A window served from the cache gets the prediction of the
+    first window with the same quantized values, the error introduced by the quantization
+    is reported by the simulation metrics under the name of the wrapper, together with the
+    hit rate of the cache (see `add_hit_rate`).
+
+    The cache is not part of the state returned by `get_state`, which stays None: the
+    wrapper is exempt from the `BasePredictor.get_state` contract so that batches are
+    predicted directly instead of with `predict_unrolled`, and it can be shared like its
+    inner predictor. Its predictions still depend on the windows cached before, so the
+    sweep runner never simulates it in lockstep with other configurations, and `reset`
+    clears the cache.
+    """
+
+    def __init__(
+        self, predictor: BasePredictor, resolution: float, max_size: int = 4096
+    ):
+        """
+        Initializes the cache.
+
+        Parameters:
+            predictor (BasePredictor): Stateless predictor to wrap.
+            resolution (float): Quantization step of the window values, in the unit of the data.
+            max_size (int, optional): Maximum number of cached predictions. Default is 4096.
+        """
+        super().__init__()
+
+        assert resolution > 0
+        assert max_size > 0
+        if predictor.get_state() is not None:
+            _logger.fatal(f"cannot cache stateful predictor '{predictor.name()}'")
+            raise Exception(f"cannot cache stateful predictor '{predictor.name()}'")
+
+        self._predictor = predictor
+        self._resolution = resolution
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self.stats = CacheStats()
+
+    def __repr__(self):
+        return (
+            f"CachedPredictor(predictor={self._predictor.name()}, "
+            f"resolution={self._resolution}, hit_rate={self.stats.hit_rate():.3f})"
+        )
+
+    def name(self) -> str:
+        return f"{self._predictor.name()}-cache{self._resolution:g}"
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        keys = np.round(x[:, :, 0] / self._resolution).astype(np.int64)
+
+        # windows of the batch sharing their quantized values are looked up and predicted
+        # once, the repeated ones count as hits as in a step by step simulation
+        unique_keys, first, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        rows = [None] * unique_keys.shape[0]
+        misses = []
+        for u in np.argsort(first):
+            key = unique_keys[u].tobytes()
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                rows[u] = self._cache[key]
+            else:
+                misses.append(u)
+        self.stats.hits += x.shape[0] - len(misses)
+        self.stats.misses += len(misses)
+
+        if len(misses) > 0:
+            start = time.perf_counter()
+            y_miss = self._predictor.predict(x[first[misses]])
+            self.stats.miss_time += time.perf_counter() - start
+
+            for j, u in enumerate(misses):
+                rows[u] = y_miss[j].copy()
+                self._cache[unique_keys[u].tobytes()] = rows[u]
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+                self.stats.evictions += 1
+
+        return np.stack(rows)[inverse.reshape(-1)]
+
+    def reset(self):
+        """
+        Drops the cached predictions, the counters are kept.
+        """
+        self._cache.clear()
+
+    def counters(self) -> dict:
+        return {
+            "cache_hits": self.stats.hits,
+            "cache_misses": self.stats.misses,
+            "cache_evictions": self.stats.evictions,
+            "cache_miss_time": self.stats.miss_time,
+        }
+
+    def update(self, sample):
+        return self._predictor.update(sample)
+
+
+def add_hit_rate(metrics: dict):
+    """
+    Adds the 'cache_hit_rate' of the counters of a `CachedPredictor` to a metrics dictionary, if they are present.
+
+    The rate is computed from the summed hits and misses, so it is also correct for the
+    total of many runs.
+
+    Parameters:
+        metrics (dict): Metrics including the counters returned by `CachedPredictor.counters`.
+    """
+    if "cache_hits" not in metrics:
+        return
+    lookups = metrics["cache_hits"] + metrics["cache_misses"]
+    metrics["cache_hit_rate"] = metrics["cache_hits"] / lookups if lookups > 0 else 0.0
+    _logger.debug(f"cache hit rate: {metrics['cache_hit_rate']:.3f}")
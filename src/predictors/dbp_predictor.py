@@ -28,20 +28,128 @@ class DBPPredictor(BasePredictor):
         return "DBP"
 
     def predict(self, x):
-        # compute sigma from
-        sigma = (
-            np.mean(x[:, -self._edge_points :], axis=1)
-            - np.mean(x[:, : self._edge_points], axis=1)
-        ) / (self._learning_phase - 1)
-
-        # predict next time_steps
-        ret = np.zeros((x.shape[0], self._time_steps, 1))
-        for ts in range(self._time_steps):
-            ret[:, ts] = np.mean(x[:, -self._edge_points :], axis=1) + (
-                (ts + 1) * sigma
-            )
-        ret = ret.reshape((x.shape[0], self._time_steps))
-        return ret
+        head = np.mean(x[:, : self._edge_points, 0], axis=1)
+        tail = np.mean(x[:, -self._edge_points :, 0], axis=1)
+        return self._extrapolate(head, tail)
+
+    def predict_series(self, series: np.ndarray, window_size: int) -> np.ndarray:
+        """
+        Predicts the values following every window of a time series, without building the windows.
+
+        The result at index `i` is the prediction of the window `series[i : i + window_size]`,
+        the same value returned by `predict` for that window.
+
+        Parameters:
+            series (np.ndarray): The time series as an array with shape (N,) or (N, 1).
+            window_size (int): Size of the windows.
+
+        Returns:
+            np.ndarray: Predictions as a 2-D array with shape (N - window_size + 1, ts).
+        """
+        series = series.reshape(-1)
+        windows = series.shape[0] - window_size + 1
+
+        # mean of every run of edge points: the head of the window at index i
+        # starts at i and its tail starts at i + window_size - edge_points
+        edge_means = np.mean(
+            np.lib.stride_tricks.sliding_window_view(series, self._edge_points),
+            axis=1,
+        )
+        head = edge_means[:windows]
+        tail = edge_means[window_size - self._edge_points :][:windows]
+        return self._extrapolate(head, tail)
+
+    def _extrapolate(self, head: np.ndarray, tail: np.ndarray) -> np.ndarray:
+        """
+        Extrapolates the next time steps from the means of the edge points of each window.
+        """
+        sigma = (tail - head) / (self._learning_phase - 1)
+        steps = np.arange(1, self._time_steps + 1)
+        return tail[:, np.newaxis] + np.outer(sigma, steps)
 
     def update(self, sample):
         return None
+
+
+class IncrementalDBPPredictor(DBPPredictor):
+    """
+    Stateful DBP predictor for simulations that shift the window by one sample per step.
+
+    The predictor keeps its own copy of the window in a circular buffer stored twice
+    (so that the window is always a contiguous slice) and is advanced with `update`,
+    which the simulations call with the value appended to their buffer. Each prediction
+    checks that the window is the tracked one and then only reads its edge points, and
+    the result is identical to the one of `DBPPredictor`.
+    """
+
+    def __init__(self, learning_phase: int, edge_points: int = 3):
+        """
+        Initializes the IncrementalDBPPredictor.
+
+        Parameters:
+            learning_phase (int): Length of the learning phase.
+            edge_points (int, optional): Number of values to use from the start and end of the window for trend estimation. Default is 3.
+        """
+        super().__init__(learning_phase, edge_points)
+        self._steps = np.arange(1, self._time_steps + 1, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the window, the next prediction primes the predictor again.
+        """
+        self._data = None
+        self._start = 0
+        self._window_size = 0
+
+    def get_state(self):
+        data = None if self._data is None else self._data.copy()
+        return (data, self._start, self._window_size)
+
+    def set_state(self, state):
+        data, self._start, self._window_size = state
+        self._data = None if data is None else data.copy()
+
+    def predict(self, x):
+        # batches and windows not tracked by the predictor use the stateless path
+        if x.shape[0] != 1:
+            return super().predict(x)
+        if not self._tracks(x):
+            self._prime(x)
+
+        start = self._start
+        end = start + self._window_size
+        head = self._data[start : start + self._edge_points].sum() / self._edge_points
+        tail = self._data[end - self._edge_points : end].sum() / self._edge_points
+        sigma = (tail - head) / (self._learning_phase - 1)
+        return (tail + sigma * self._steps).reshape((1, self._time_steps))
+
+    def update(self, sample):
+        if self._data is None:
+            return None
+
+        # overwrite the oldest value of both copies and move the window start
+        value = np.asarray(sample).reshape(-1)[0]
+        self._data[self._start] = value
+        self._data[self._start + self._window_size] = value
+        self._start = (self._start + 1) % self._window_size
+        return None
+
+    def _tracks(self, x) -> bool:
+        """
+        Checks that `x` is the window tracked by the predictor.
+
+        The whole window is compared, since realignments such as `lerp` rewrite the
+        buffer keeping its first and last values, and on flat or integer series many
+        windows share their edges. The comparison is still cheaper than priming.
+        """
+        if self._data is None or x.shape[1] != self._window_size:
+            return False
+        start = self._start
+        return np.array_equal(self._data[start : start + self._window_size], x[0, :, 0])
+
+    def _prime(self, x):
+        window = x[0, :, 0]
+        self._window_size = window.shape[0]
+        self._data = np.concatenate([window, window]).astype(np.float64)
+        self._start = 0
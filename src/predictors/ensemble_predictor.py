@@ -0,0 +1,176 @@
+from .. import logger
+from .predictor import BasePredictor
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+COMBINE_STRATEGIES = ["mean", "median", "best"]
+
+
+class EnsemblePredictor(BasePredictor):
+    """
+    Predictor running several member predictors on the same windows.
+
+    Each member receives the last values of the ensemble window according to its own
+    window size, so the window of the ensemble must be as large as the largest member
+    window. The predictions of the members are combined with one of the strategies:
+    - 'mean': average of the member predictions.
+    - 'median': median of the member predictions.
+    - 'best': prediction of the member with the lowest recent error, tracked as an
+      exponential moving average of the absolute error of its one-step predictions.
+
+    Recent errors are updated with `update` when predicting one window at a time, and
+    along the batch when predicting many windows at once, in which case the windows are
+    expected to be consecutive windows of the same series (as built by `to_supervised`).
+    The errors learned along a batch are kept, so predicting a series in batches or one
+    window at a time gives the same results.
+
+    The ensemble is stateful when it tracks the recent errors ('best') or when any of its
+    members is stateful, see `get_state`.
+    """
+
+    def __init__(
+        self,
+        members: list[tuple[BasePredictor, int]],
+        combine: str = "mean",
+        smoothing: float = 0.1,
+    ):
+        """
+        Initializes the ensemble.
+
+        Parameters:
+            members (list): List of (predictor, window size) pairs.
+            combine (str, optional): Combination strategy, one of `COMBINE_STRATEGIES`. Default is 'mean'.
+            smoothing (float, optional): Weight of the newest error in the moving average used by 'best'. Default is 0.1.
+
+        Raises:
+            Exception: If the combination strategy is unknown.
+        """
+        super().__init__()
+
+        assert len(members) > 0
+        assert 0.0 < smoothing <= 1.0
+        if combine not in COMBINE_STRATEGIES:
+            _logger.fatal(f"unknown combine strategy '{combine}'")
+            raise Exception(f"unknown combine strategy '{combine}'")
+
+        self._members = members
+        self._combine = combine
+        self._smoothing = smoothing
+        self.reset()
+
+    def name(self) -> str:
+        return f"ensemble-{self._combine}"
+
+    def members(self) -> list[tuple[str, int]]:
+        """
+        Returns the name and window size of each member.
+        """
+        return [(predictor.name(), ws) for predictor, ws in self._members]
+
+    def window_size(self) -> int:
+        """
+        Returns the minimum window size required by the ensemble.
+        """
+        return max(ws for _, ws in self._members)
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        _, combined = self.predict_all(x)
+        return combined
+
+    def predict_all(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Predicts the windows with every member and combines their predictions.
+
+        Batches of windows are predicted by stateful members with `predict_unrolled`.
+
+        Parameters:
+            x (np.ndarray): Input data as 3-D array with shape (N, ws, 1).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Member predictions with shape (M, N, ts) and combined predictions with shape (N, ts).
+        """
+        assert x.shape[1] >= self.window_size()
+
+        preds = []
+        for predictor, ws in self._members:
+            if x.shape[0] > 1 and predictor.get_state() is not None:
+                preds.append(predictor.predict_unrolled(x[:, -ws:]))
+            else:
+                preds.append(predictor.predict(x[:, -ws:]))
+        preds = np.stack(preds)
+
+        match self._combine:
+            case "mean":
+                combined = np.mean(preds, axis=0)
+            case "median":
+                combined = np.median(preds, axis=0)
+            case "best":
+                recent = self._recent_errors(preds, x)
+                best = np.argmin(recent, axis=0)
+                combined = preds[best, np.arange(x.shape[0])]
+                # keep the errors learned along the batch, the error of the last
+                # prediction is added by the next `update`
+                self._errors = recent[:, -1]
+
+        self._last_preds = preds[:, -1, 0]
+        return preds, combined
+
+    def update(self, sample):
+        value = np.asarray(sample).reshape(-1)[0]
+        if self._last_preds is not None:
+            self._errors = self._ewma(
+                np.abs(self._last_preds - value)[:, np.newaxis], self._errors
+            )[:, -1]
+        for predictor, _ in self._members:
+            predictor.update(sample)
+
+    def reset(self):
+        self._errors = np.zeros(len(self._members))
+        self._last_preds = None
+        for predictor, _ in self._members:
+            predictor.reset()
+
+    def get_state(self):
+        """
+        Returns a copy of the state of the ensemble, that can be restored with `set_state`.
+
+        Returns:
+            The states of the members, the recent errors and the last predictions, or None
+            when the members are stateless and the recent errors are not used.
+        """
+        states = tuple(predictor.get_state() for predictor, _ in self._members)
+        if self._combine != "best" and all(state is None for state in states):
+            return None
+        last_preds = None if self._last_preds is None else self._last_preds.copy()
+        return (states, self._errors.copy(), last_preds)
+
+    def set_state(self, state):
+        if state is None:
+            return
+        states, errors, last_preds = state
+        for (predictor, _), member_state in zip(self._members, states):
+            predictor.set_state(member_state)
+        self._errors = errors.copy()
+        self._last_preds = None if last_preds is None else last_preds.copy()
+
+    def _recent_errors(self, preds: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the recent error of each member at each window, with shape (M, N).
+
+        The first prediction of window i - 1 is compared with the last value of window i.
+        """
+        errors = np.abs(preds[:, :-1, 0] - x[np.newaxis, 1:, -1, 0])
+        recent = self._ewma(errors, self._errors)
+        return np.concatenate([self._errors[:, np.newaxis], recent], axis=1)
+
+    def _ewma(self, errors: np.ndarray, initial: np.ndarray) -> np.ndarray:
+        """
+        Exponential moving average along the last axis of `errors`, starting from `initial`.
+        """
+        # imported here to avoid loading scipy with the predictors module
+        from scipy.signal import lfilter
+
+        a = self._smoothing
+        zi = (1.0 - a) * initial[:, np.newaxis]
+        return lfilter([a], [1.0, -(1.0 - a)], errors, axis=1, zi=zi)[0]
@@ -1,7 +1,9 @@
 from .predictor import BasePredictor
-from filterpy.kalman import KalmanFilter
+from .. import logger
 import numpy as np
 
+_logger = logger.get_logger(__name__)
+
 
 class KFPredictor(BasePredictor):
     """
@@ -10,17 +12,26 @@ class KFPredictor(BasePredictor):
     This implementation uses the `filterpy` library to apply a basic linear Kalman filter
     to a time series. The predictor performs prediction and update steps explicitly and
     supports only single time-step forecasts.
+
+    Since F, H, Q and R are constant, the covariance and the gain of the filter converge
+    after a few steps. In steady-state mode the converged gain is computed once and the
+    predict and update steps only advance the state vector, without using `filterpy`.
     """
 
-    def __init__(self, x_size):
+    def __init__(self, x_size, steady_state: bool = False):
         """
         Initializes the Kalman Filter with the specified state size.
 
         Parameters:
             x_size (int): Dimension of the internal state vector.
+            steady_state (bool, optional): Whether to use the steady-state gain from the first step. Default is False.
         """
         self.x_size = x_size
         self._time_steps = 1
+        self._steady_state = steady_state
+
+        # imported here to avoid loading filterpy with the predictors module
+        from filterpy.kalman import KalmanFilter
 
         # TODO: Make it work with multi TS
         self._kf = KalmanFilter(dim_x=self.x_size, dim_z=self._time_steps)
@@ -45,12 +56,141 @@ class KFPredictor(BasePredictor):
         # self.kf.H = np.array([[0.05,0.05,0.1,0.3,0.5]])
         # self.kf.H = np.array([[0.5,0.3,0.1,0.05,0.05]])
 
+        # keep the initial state to run independent filters in `predict_unrolled`
+        self._x0 = self._kf.x.copy()
+        self._P0 = self._kf.P.copy()
+
+        if self._steady_state:
+            self._K = self._steady_state_gain()
+            self._F = self._kf.F
+            self._h = self._kf.H[0]
+            self._k = self._K[:, 0]
+            self._x = self._x0[:, 0].copy()
+
     def name(self) -> str:
         return "KF"
 
     def predict(self, x: np.ndarray) -> np.ndarray:
+        if self._steady_state:
+            self._x = self._F @ self._x
+            return np.array([[self._h @ self._x]])
+
         self._kf.predict()
         return np.dot(self._kf.H, self._kf.x)
 
     def update(self, sample: float):
+        if self._steady_state:
+            z = np.asarray(sample).reshape(-1)[0]
+            self._x = self._x + self._k * (z - self._h @ self._x)
+            return
+
         self._kf.update(sample)
+
+    def get_state(self) -> dict:
+        """
+        Returns a copy of the state of the filter, that can be restored with `set_state`.
+
+        Returns:
+            dict: The state vector 'x' and, unless in steady-state mode, the covariance 'P'.
+        """
+        if self._steady_state:
+            return {"x": self._x.copy()}
+        return {"x": self._kf.x.copy(), "P": self._kf.P.copy()}
+
+    def set_state(self, state: dict):
+        """
+        Restores a state returned by `get_state`.
+
+        Parameters:
+            state (dict): The state to restore.
+        """
+        if self._steady_state:
+            self._x = state["x"].reshape(-1).copy()
+        else:
+            self._kf.x = state["x"].copy()
+            self._kf.P = state["P"].copy()
+
+    def reset(self):
+        self.set_state({"x": self._x0.copy(), "P": self._P0.copy()})
+
+    def _steady_state_gain(
+        self, tol: float = 1e-12, max_iter: int = 100000
+    ) -> np.ndarray:
+        """
+        Computes the steady-state Kalman gain with shape (x_size, 1).
+
+        The gain is obtained from the solution of the discrete algebraic Riccati equation.
+        When the equation has no stabilizing solution, as with the default model where
+        only the mean of the state is observable, the Riccati recursion is iterated until
+        the gain converges (the covariance of the unobservable directions keeps growing,
+        but it does not affect the gain).
+        """
+        # imported here to avoid loading scipy with the predictors module
+        from scipy.linalg import solve_discrete_are
+
+        F, H, Q, R = self._kf.F, self._kf.H, self._kf.Q, self._kf.R
+
+        try:
+            P = solve_discrete_are(F.T, H.T, Q, R)
+            return P @ H.T @ np.linalg.inv(H @ P @ H.T + R)
+        except (np.linalg.LinAlgError, ValueError) as e:
+            _logger.debug(f"cannot solve the riccati equation ({e}), iterate it")
+
+        I = np.eye(self.x_size)
+        P = self._P0.copy()
+        K = np.zeros((self.x_size, self._time_steps))
+        for _ in range(max_iter):
+            P = F @ P @ F.T + Q
+            PHT = P @ H.T
+            K_next = PHT @ np.linalg.inv(H @ PHT + R)
+            I_KH = I - K_next @ H
+            P = I_KH @ P @ I_KH.T + K_next @ R @ K_next.T
+            if np.max(np.abs(K_next - K)) < tol:
+                return K_next
+            K = K_next
+
+        _logger.fatal(f"kalman gain did not converge in {max_iter} iterations")
+        raise Exception(f"kalman gain did not converge in {max_iter} iterations")
+
+    def predict_unrolled(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predicts the value following each window with an independent filter per window.
+
+        Every filter starts from the initial state of the predictor, runs a predict and
+        an update step for each value of its window and then predicts the next value.
+        All the filters share F, H, Q, R and the initial covariance, so their covariance
+        and gain evolve identically: they are computed once per step, while the states
+        of all the windows are advanced together as a (N, x_size) batch.
+
+        Parameters:
+            x (np.ndarray): Input windows as 3-D array with shape (N, ws, 1).
+
+        Returns:
+            np.ndarray: Predictions as a 2-D array with shape (N, 1).
+        """
+        F, H, Q, R = self._kf.F, self._kf.H, self._kf.Q, self._kf.R
+        I = np.eye(self.x_size)
+
+        states = np.repeat(self._x0.T, x.shape[0], axis=0)
+        P = self._P0.copy()
+        for t in range(x.shape[1]):
+            # predict
+            states = states @ F.T
+            if self._steady_state:
+                residuals = x[:, t] - states @ H.T
+                states = states + residuals @ self._K.T
+                continue
+            P = F @ P @ F.T + Q
+
+            # update, same formulation of filterpy (Joseph form of the covariance)
+            PHT = P @ H.T
+            S = H @ PHT + R
+            K = PHT @ np.linalg.inv(S)
+            residuals = x[:, t] - states @ H.T
+            states = states + residuals @ K.T
+            I_KH = I - K @ H
+            P = I_KH @ P @ I_KH.T + K @ R @ K.T
+
+        # predict next value
+        states = states @ F.T
+        return states @ H.T
@@ -0,0 +1,210 @@
+from .. import logger
+from .predictor import BasePredictor
+from ..dataset import Dataset, to_supervised
+from ..ml_model import get_model_path
+from ..window import WindowConfig
+import os
+import numpy as np
+
+# version of the stored index, indexes with a different version are built again
+_INDEX_VERSION = 2
+
+
+def get_knn_index_path(
+    models_path: str,
+    dataset_name: str,
+    window_config: WindowConfig,
+    seed: int,
+) -> str:
+    """
+    Returns the path of the window index of a `KNNPredictor`, stored next to the Keras models.
+
+    Parameters:
+        models_path (str): Base path where models are stored.
+        dataset_name (str): Name of the dataset used for training.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used to split the dataset.
+
+    Returns:
+        str: The path of the `.npz` file.
+    """
+    path = get_model_path("knn", models_path, dataset_name, window_config, seed)
+    return path + ".npz"
+
+
+def _anchor(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the windows relative to their last value, with shape (N, ws), and the last values.
+    """
+    last = x[:, -1:]
+    return x - last, last
+
+
+class KNNPredictor(BasePredictor):
+    """
+    Pattern-matching predictor based on the nearest training windows.
+
+    Training windows are stored in a KD-tree relative to their last value, together with
+    their continuations relative to the same value, so a pattern is matched regardless of
+    its level. The continuation of a window is the median of the continuations of its `k`
+    nearest training windows, added to its last value.
+
+    Windows are not scaled by their standard deviation: on integer or almost flat series
+    the scaled continuations of flat training windows explode when applied to a query with
+    a larger amplitude. With the median of the offsets the prediction falls back to the
+    last value when the neighbours disagree, and the predictor beats the naive last-value
+    baseline on the bundled datasets (see `benchmark_knn.py`).
+    """
+
+    def __init__(self, window_config: WindowConfig, k: int = 30):
+        """
+        Initializes an empty predictor.
+
+        Parameters:
+            window_config (WindowConfig): Window configuration parameters.
+            k (int, optional): Number of neighbours of each prediction. Default is 30.
+        """
+        super().__init__()
+        self._logger = logger.get_logger(self.__class__.__name__)
+
+        assert k > 0
+
+        self._window_config = window_config
+        self._k = k
+        self._windows = None
+        self._continuations = None
+        self._tree = None
+
+    def name(self) -> str:
+        return f"KNN{self._k}"
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "KNNPredictor":
+        """
+        Builds the index over supervised windows, as returned by `to_supervised`.
+
+        Parameters:
+            x (np.ndarray): Input windows with shape (N, ws, 1).
+            y (np.ndarray): Targets with shape (N, ts).
+
+        Returns:
+            KNNPredictor: The fitted predictor.
+        """
+        x = x.reshape((x.shape[0], self._window_config.ws)).astype(np.float64)
+        y = y.reshape((y.shape[0], self._window_config.ts)).astype(np.float64)
+
+        windows, last = _anchor(x)
+        self._build(windows, y - last)
+        return self
+
+    def fit_dataset(self, dataset: Dataset, seed: int) -> "KNNPredictor":
+        """
+        Builds the index over the training split of a dataset, the same used to train the ML models.
+
+        Parameters:
+            dataset (Dataset): The dataset to train on.
+            seed (int): Random seed used to split the dataset.
+
+        Returns:
+            KNNPredictor: The fitted predictor.
+        """
+        train_data, _ = dataset.train_test_split(type="random", seed=seed)
+        train_data = train_data.reshape((train_data.shape[0] * train_data.shape[1], 1))
+        x_train, y_train = to_supervised(train_data, self._window_config)
+        return self.fit(x_train, y_train)
+
+    def save(self, path: str):
+        """
+        Stores the anchored windows and continuations into a `.npz` file.
+
+        Parameters:
+            path (str): Path of the output file.
+        """
+        assert self._tree is not None, "predictor must be fitted before saving"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(
+            path,
+            version=_INDEX_VERSION,
+            windows=self._windows,
+            continuations=self._continuations,
+        )
+        self._logger.debug(f"saved index into '{path}'")
+
+    def load(self, path: str) -> "KNNPredictor":
+        """
+        Loads an index stored with `save` and rebuilds the KD-tree.
+
+        Parameters:
+            path (str): Path of the `.npz` file.
+
+        Returns:
+            KNNPredictor: The fitted predictor.
+
+        Raises:
+            Exception: If the index was stored by a different version of the predictor.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"]) if "version" in data.files else 1
+            if version != _INDEX_VERSION:
+                self._logger.fatal(f"index '{path}' has version {version}")
+                raise Exception(f"index '{path}' has version {version}")
+            windows = data["windows"]
+            continuations = data["continuations"]
+        assert windows.shape[1] == self._window_config.ws
+        assert continuations.shape[1] == self._window_config.ts
+        self._build(windows, continuations)
+        self._logger.debug(f"loaded index from '{path}'")
+        return self
+
+    def fit_or_load(
+        self, models_path: str, dataset: Dataset, seed: int
+    ) -> "KNNPredictor":
+        """
+        Loads the index of a dataset from the models directory, building and storing it on first use
+        or when it was stored by a different version of the predictor.
+
+        Parameters:
+            models_path (str): Base path where models are stored.
+            dataset (Dataset): The dataset to train on.
+            seed (int): Random seed used to split the dataset.
+
+        Returns:
+            KNNPredictor: The fitted predictor.
+        """
+        path = get_knn_index_path(
+            models_path, dataset.name(), self._window_config, seed
+        )
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                current = "version" in data.files and data["version"] == _INDEX_VERSION
+            if current:
+                return self.load(path)
+            self._logger.info(f"index '{path}' is outdated, build it again")
+        self.fit_dataset(dataset, seed)
+        self.save(path)
+        return self
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        assert self._tree is not None, "predictor must be fitted before predicting"
+
+        x = x.reshape((x.shape[0], self._window_config.ws)).astype(np.float64)
+        windows, last = _anchor(x)
+
+        # query every window at once, indices have shape (N, k)
+        k = min(self._k, self._windows.shape[0])
+        _, idx = self._tree.query(windows, k=k, workers=-1)
+        idx = idx.reshape((x.shape[0], k))
+
+        continuations = np.median(self._continuations[idx], axis=1)
+        return continuations + last
+
+    def update(self, sample):
+        return None
+
+    def _build(self, windows: np.ndarray, continuations: np.ndarray):
+        # imported here to avoid loading scipy with the predictors module
+        from scipy.spatial import cKDTree
+
+        self._windows = windows
+        self._continuations = continuations
+        self._tree = cKDTree(windows)
+        self._logger.debug(f"built index over {windows.shape[0]} windows")
@@ -1,8 +1,9 @@
 from .. import logger
 from .predictor import BasePredictor
 from ..ml_model import get_model_path
+from ..model_cache import ModelCache, get_default_cache
 from ..window import WindowConfig
-from tensorflow import keras
+import tensorflow as tf
 import numpy as np
 
 
@@ -18,16 +19,27 @@ class MLPredictor(BasePredictor):
         dataset_name: str,
         window_config: WindowConfig,
         seed: int,
+        cache: ModelCache = None,
+        fast_batch_size: int = 32,
     ):
         """
         Initializes the ML predictor by loading a model from disk.
 
+        Models are loaded through a `ModelCache`, so predictors created for the same
+        model (e.g. one for each error threshold) share a single in-memory copy.
+
+        Small batches, such as the single window predicted at every step of a simulation,
+        skip `Model.predict` and call the model through a `tf.function` traced once with
+        a fixed input signature, avoiding the data adapter and callbacks setup of each call.
+
         Parameters:
             model_name (str): The name of the model.
             models_path (str): Base path to the directory containing trained models.
             dataset_name (str): Name of the dataset used during training.
             window_config (WindowConfig): Window configuration object.
             seed (int): Seed used to ensure reproducibility.
+            cache (ModelCache, optional): Cache used to load the model. Default is the process-wide cache.
+            fast_batch_size (int, optional): Largest batch predicted through the fast path. Default is 32.
         """
         super().__init__()
         self._logger = logger.get_logger(self.__class__.__name__)
@@ -38,16 +50,56 @@ class MLPredictor(BasePredictor):
         self._full_model_path = get_model_path(
             model_name, models_path, dataset_name, window_config, seed
         )
+        self._cache = cache if cache is not None else get_default_cache()
         self._logger.debug(f"load model from '{self._full_model_path}'")
-        self._inner_model = keras.models.load_model(self._full_model_path)
+        self._inner_model = self._cache.get(self._full_model_path)
+
+        self._fast_batch_size = fast_batch_size
+        self._serving_fn = None
+
+    def __getstate__(self):
+        # the model is not pickled, the copy loads it from the model cache of its process
+        state = self.__dict__.copy()
+        del state["_cache"]
+        del state["_inner_model"]
+        state["_serving_fn"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = get_default_cache()
+        self._inner_model = self._cache.get(self._full_model_path)
 
     def name(self) -> str:
         return self._model_name
 
+    def model(self) -> tf.keras.Model:
+        """
+        Returns the Keras model used by the predictor, shared with the other predictors
+        loading it from the same model cache.
+        """
+        return self._inner_model
+
     def predict(self, x) -> np.ndarray:
-        return self._inner_model.predict(x, verbose=0).reshape(
-            (x.shape[0], self._window_config.ts)
-        )
+        if x.shape[0] <= self._fast_batch_size:
+            y = self._fast_predict(x)
+        else:
+            y = self._inner_model.predict(x, verbose=0)
+        return y.reshape((x.shape[0], self._window_config.ts))
+
+    def _fast_predict(self, x) -> np.ndarray:
+        """
+        Calls the model directly on a small batch through a traced `tf.function`.
+        """
+        if self._serving_fn is None:
+            model = self._inner_model
+            self._serving_fn = tf.function(
+                lambda x: model(x, training=False),
+                input_signature=[
+                    tf.TensorSpec((None, self._window_config.ws, 1), tf.float32)
+                ],
+            )
+        return self._serving_fn(np.asarray(x, dtype=np.float32)).numpy()
 
     def update(self, sample):
         return None
@@ -0,0 +1,68 @@
+from .. import logger
+from .predictor import BasePredictor
+from ..numpy_model import NumpyModel, StreamingNumpyModel, get_numpy_model_path
+from ..window import WindowConfig
+import numpy as np
+
+
+class NumpyMLPredictor(BasePredictor):
+    """
+    Predictor that runs a machine learning model exported to NumPy.
+
+    It produces the same predictions of `MLPredictor` (within floating point tolerance)
+    without importing TensorFlow, which makes it suitable for fast simulations and
+    for mimicking the inference on a microcontroller.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        models_path: str,
+        dataset_name: str,
+        window_config: WindowConfig,
+        seed: int,
+        streaming: bool = False,
+    ):
+        """
+        Initializes the predictor by loading the NumPy export of a model from disk.
+
+        The model must be exported first with `numpy_model.export_numpy_model`.
+
+        In streaming mode, single windows that are shifted by one sample with respect to the
+        previous call (as in the DLBDC simulation) reuse the input projections of the first
+        LSTM layer computed at the previous steps (see `StreamingNumpyModel`).
+
+        Parameters:
+            model_name (str): The name of the model.
+            models_path (str): Base path to the directory containing trained models.
+            dataset_name (str): Name of the dataset used during training.
+            window_config (WindowConfig): Window configuration object.
+            seed (int): Seed used to ensure reproducibility.
+            streaming (bool, optional): Whether to enable the streaming mode. Default is False.
+        """
+        super().__init__()
+        self._logger = logger.get_logger(self.__class__.__name__)
+
+        self._model_name = model_name
+        self._window_config = window_config
+
+        self._full_model_path = get_numpy_model_path(
+            model_name, models_path, dataset_name, window_config, seed
+        )
+        self._logger.debug(f"load numpy model from '{self._full_model_path}'")
+        self._inner_model = NumpyModel.load(self._full_model_path)
+        if streaming:
+            self._inner_model = StreamingNumpyModel(self._inner_model)
+
+    def name(self) -> str:
+        return f"{self._model_name}-numpy"
+
+    def predict(self, x) -> np.ndarray:
+        return self._inner_model(x).reshape((x.shape[0], self._window_config.ts))
+
+    def reset(self):
+        if isinstance(self._inner_model, StreamingNumpyModel):
+            self._inner_model.reset()
+
+    def update(self, sample):
+        return None
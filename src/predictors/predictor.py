@@ -33,4 +33,86 @@ class BasePredictor:
         Parameters:
             sample (float): The new sample data.
         """
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    def get_state(self):
+        """
+        Returns a copy of the internal state of the predictor, that can be restored with `set_state`.
+
+        The default returns None, which marks the predictor as stateless: wrappers that
+        share a predictor across windows or streams (e.g. `MultiStreamPredictor`,
+        `CachedPredictor` and the lockstep sweep) accept it only in that case. Predictors
+        whose predictions depend on previous calls of `predict` or `update` must override
+        `get_state`, `set_state` and `reset`. The only exception is `CachedPredictor`,
+        which keeps its cache out of the state (see its documentation).
+
+        Returns:
+            The state of the predictor, or None for stateless predictors.
+        """
+        return None
+
+    def set_state(self, state):
+        """
+        Restores a state returned by `get_state`.
+
+        Parameters:
+            state: The state to restore.
+        """
+        return None
+
+    def reset(self):
+        """
+        Brings the predictor back to its initial state.
+        """
+        return None
+
+    def counters(self) -> dict:
+        """
+        Returns the counters collected by the predictor while predicting (e.g. the hits of a cache),
+        saved with the simulation and validation metrics.
+
+        Counters only grow and are not cleared by `reset`, so the counters of a run are the
+        difference between their values at its end and at its start, and the counters of
+        many runs (e.g. the chunks of a simulation) can be summed.
+
+        Returns:
+            dict: The counters, empty for predictors that do not collect any.
+        """
+        return {}
+
+    def predict_unrolled(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predicts the values following each window with a stateful predictor.
+
+        For every window the predictor starts from its initial state, is primed with a
+        predict and an update step for each value of the window and then predicts the
+        following values. The initial state is captured once and restored for each window,
+        and the state of the predictor before the call is restored at the end.
+
+        Parameters:
+            x (np.ndarray): Input data as 3-D array with shape (N, ws, 1).
+
+        Returns:
+            np.ndarray: Model predictions as a 2-D array with shape (N, ts).
+        """
+        current_state = self.get_state()
+        self.reset()
+        initial_state = self.get_state()
+
+        y_pred = None
+        for i in range(x.shape[0]):
+            self.set_state(initial_state)
+
+            # prime the predictor with the data on the window
+            for val in x[i]:
+                self.predict(x[i : i + 1])
+                self.update(val)
+
+            # predict next values
+            pred = self.predict(x[i : i + 1])
+            if y_pred is None:
+                y_pred = np.zeros((x.shape[0], pred.shape[-1]))
+            y_pred[i] = pred.reshape(-1)
+
+        self.set_state(current_state)
+        return y_pred
@@ -0,0 +1,55 @@
+from .. import logger
+from .predictor import BasePredictor
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+
+class RecursivePredictor(BasePredictor):
+    """
+    Wrapper turning a one-step predictor into a multi-step one.
+
+    The next value is predicted, appended to the window in place of the oldest value and
+    fed back to the predictor until `time_steps` values are predicted. All the windows
+    of a batch advance together, so the inner predictor is called once per step of the
+    horizon regardless of the batch size. Only the first value predicted by the inner
+    predictor is used.
+    """
+
+    def __init__(self, predictor: BasePredictor, time_steps: int):
+        """
+        Initializes the wrapper.
+
+        Parameters:
+            predictor (BasePredictor): Stateless one-step predictor to wrap.
+            time_steps (int): Number of predicted values.
+        """
+        super().__init__()
+
+        assert time_steps > 0
+        if predictor.get_state() is not None:
+            _logger.fatal(f"cannot recurse stateful predictor '{predictor.name()}'")
+            raise Exception(f"cannot recurse stateful predictor '{predictor.name()}'")
+
+        self._predictor = predictor
+        self._time_steps = time_steps
+
+    def name(self) -> str:
+        return f"{self._predictor.name()}-rec{self._time_steps}"
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        buffer = np.array(x, dtype=np.float64)
+        y_pred = np.zeros((x.shape[0], self._time_steps))
+        for t in range(self._time_steps):
+            y_pred[:, t] = self._predictor.predict(buffer)[:, 0]
+
+            # shift the windows in place and append the predicted values
+            buffer[:, :-1] = buffer[:, 1:]
+            buffer[:, -1, 0] = y_pred[:, t]
+        return y_pred
+
+    def update(self, sample):
+        return self._predictor.update(sample)
+
+    def reset(self):
+        self._predictor.reset()
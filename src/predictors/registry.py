@@ -0,0 +1,81 @@
+from .. import logger
+from .predictor import BasePredictor
+import importlib
+
+_logger = logger.get_logger(__name__)
+
+# predictor name -> (module, class name), modules are imported only when the predictor is first used
+_PREDICTORS = {
+    "ml": (".ml_predictor", "MLPredictor"),
+    "numpy": (".numpy_predictor", "NumpyMLPredictor"),
+    "tflite": (".tflite_predictor", "TFLitePredictor"),
+    "dbp": (".dbp_predictor", "DBPPredictor"),
+    "dbp-incremental": (".dbp_predictor", "IncrementalDBPPredictor"),
+    "kf": (".kf_predictor", "KFPredictor"),
+    "ar": (".ar_predictor", "ARPredictor"),
+    "knn": (".knn_predictor", "KNNPredictor"),
+    "ensemble": (".ensemble_predictor", "EnsemblePredictor"),
+    "cached": (".cached_predictor", "CachedPredictor"),
+    "recursive": (".recursive_predictor", "RecursivePredictor"),
+}
+
+
+def register_predictor(name: str, module: str, class_name: str):
+    """
+    Registers a predictor class under a name, without importing it.
+
+    Parameters:
+        name (str): Name used to resolve the predictor.
+        module (str): Absolute module path, or relative to `src.predictors` when starting with a dot.
+        class_name (str): Name of the predictor class inside the module.
+
+    Raises:
+        Exception: If the name is already registered.
+    """
+    if name in _PREDICTORS:
+        _logger.fatal(f"predictor '{name}' already registered")
+        raise Exception(f"predictor '{name}' already registered")
+    _PREDICTORS[name] = (module, class_name)
+
+
+def predictor_names() -> list[str]:
+    """
+    Returns the names of the registered predictors.
+    """
+    return list(_PREDICTORS.keys())
+
+
+def get_predictor_class(name: str) -> type[BasePredictor]:
+    """
+    Returns the class of a registered predictor, importing its module (and its dependencies) on first use.
+
+    Parameters:
+        name (str): Name of the predictor.
+
+    Returns:
+        type[BasePredictor]: The predictor class.
+
+    Raises:
+        Exception: If the name is not registered.
+    """
+    if name not in _PREDICTORS:
+        _logger.fatal(f"unknown predictor '{name}'")
+        raise Exception(f"unknown predictor '{name}'")
+
+    module, class_name = _PREDICTORS[name]
+    return getattr(importlib.import_module(module, __package__), class_name)
+
+
+def create_predictor(name: str, *args, **kwargs) -> BasePredictor:
+    """
+    Creates a registered predictor.
+
+    Parameters:
+        name (str): Name of the predictor.
+        *args: Positional arguments of the predictor constructor.
+        **kwargs: Keyword arguments of the predictor constructor.
+
+    Returns:
+        BasePredictor: The new predictor.
+    """
+    return get_predictor_class(name)(*args, **kwargs)
@@ -0,0 +1,67 @@
+from .. import logger
+from .predictor import BasePredictor
+from ..tflite_model import get_tflite_model_path
+from ..window import WindowConfig
+import numpy as np
+
+
+class TFLitePredictor(BasePredictor):
+    """
+    Predictor that runs a machine learning model exported to TFLite.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        models_path: str,
+        dataset_name: str,
+        window_config: WindowConfig,
+        seed: int,
+        quantization: str = "float32",
+    ):
+        """
+        Initializes the predictor by loading a TFLite model from disk.
+
+        The model must be exported first with `tflite_model.export_tflite_model`.
+        TFLite models have a fixed input of a single window, so batches are predicted one window at a time.
+
+        Parameters:
+            model_name (str): The name of the model.
+            models_path (str): Base path to the directory containing trained models.
+            dataset_name (str): Name of the dataset used during training.
+            window_config (WindowConfig): Window configuration object.
+            seed (int): Seed used to ensure reproducibility.
+            quantization (str, optional): Quantization of the model to load. Default is 'float32'.
+        """
+        super().__init__()
+        self._logger = logger.get_logger(self.__class__.__name__)
+
+        import tensorflow as tf
+
+        self._model_name = model_name
+        self._window_config = window_config
+        self._quantization = quantization
+
+        self._full_model_path = get_tflite_model_path(
+            model_name, models_path, dataset_name, window_config, seed, quantization
+        )
+        self._logger.debug(f"load tflite model from '{self._full_model_path}'")
+        self._interpreter = tf.lite.Interpreter(model_path=self._full_model_path)
+        self._interpreter.allocate_tensors()
+        self._input_idx = self._interpreter.get_input_details()[0]["index"]
+        self._output_idx = self._interpreter.get_output_details()[0]["index"]
+
+    def name(self) -> str:
+        return f"{self._model_name}-tflite-{self._quantization}"
+
+    def predict(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        ret = np.zeros((x.shape[0], self._window_config.ts), dtype=np.float32)
+        for i in range(x.shape[0]):
+            self._interpreter.set_tensor(self._input_idx, x[i : i + 1])
+            self._interpreter.invoke()
+            ret[i] = self._interpreter.get_tensor(self._output_idx).reshape(-1)
+        return ret
+
+    def update(self, sample):
+        return None
@@ -0,0 +1,334 @@
+from . import logger
+from .predictors.predictor import BasePredictor
+from .window import WindowConfig
+import asyncio
+import struct
+import time
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+# messages are a (request id, number of values) header followed by the float64 values,
+# a response without values reports that the request failed
+_HEADER = struct.Struct("<IH")
+
+
+def _latency_stats(latencies: list[float]) -> dict:
+    """
+    Returns the percentiles of a list of latencies (seconds) in microseconds.
+    """
+    if len(latencies) == 0:
+        return {"requests": 0, "p50_us": 0.0, "p99_us": 0.0}
+    latencies = np.array(latencies) * 1e6
+    return {
+        "requests": len(latencies),
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p99_us": float(np.percentile(latencies, 99)),
+    }
+
+
+async def _read_message(reader: asyncio.StreamReader) -> tuple[int, np.ndarray]:
+    request_id, size = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    values = np.frombuffer(await reader.readexactly(size * 8), dtype="<f8")
+    return request_id, values
+
+
+def _write_message(writer: asyncio.StreamWriter, request_id: int, values: np.ndarray):
+    values = np.ascontiguousarray(values, dtype="<f8").reshape(-1)
+    writer.write(_HEADER.pack(request_id, values.shape[0]) + values.tobytes())
+
+
+def _write_error(writer: asyncio.StreamWriter, request_id: int):
+    writer.write(_HEADER.pack(request_id, 0))
+
+
+def _fail_requests(futures: list[asyncio.Future], error: Exception):
+    """
+    Sets an exception on the futures of the requests that are still waiting for their result.
+    """
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
+
+
+class PredictionServer:
+    """
+    Asyncio server hosting a predictor for many clients.
+
+    Requests carry a single window and are coalesced into micro-batches: a batch is
+    predicted with one `predict` call as soon as it reaches `max_batch` windows or
+    `max_delay` seconds after its first request arrived. The predictor runs in a worker
+    thread, so new requests keep being accepted while a batch is predicted.
+    Only stateless predictors can be shared between clients.
+
+    Requests whose window does not have `ws` values, or whose batch fails to be
+    predicted or is still waiting when the server is closed, receive an error response
+    without values.
+    """
+
+    def __init__(
+        self,
+        predictor: BasePredictor,
+        window_config: WindowConfig,
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+    ):
+        """
+        Initializes the server.
+
+        Parameters:
+            predictor (BasePredictor): Stateless predictor used to serve the requests.
+            window_config (WindowConfig): Window configuration parameters.
+            max_batch (int, optional): Maximum number of windows in a batch. Default is 64.
+            max_delay (float, optional): Maximum time (seconds) a request waits for its batch to fill. Default is 0.002.
+        """
+        if predictor.get_state() is not None:
+            _logger.fatal(f"cannot serve stateful predictor '{predictor.name()}'")
+            raise Exception(f"cannot serve stateful predictor '{predictor.name()}'")
+
+        self._predictor = predictor
+        self._window_config = window_config
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+
+        self._queue = None
+        self._server = None
+        self._batcher = None
+        self._requests = set()
+        self._batch_sizes = []
+        self._latencies = []
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """
+        Starts listening on a TCP port or, when `path` is given, on a Unix socket.
+
+        Parameters:
+            host (str, optional): TCP host. Default is '127.0.0.1'.
+            port (int, optional): TCP port, 0 picks a free one. Default is 0.
+            path (str, optional): Path of the Unix socket. Default is None.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        _logger.info(f"serving '{self._predictor.name()}' on {self.address()}")
+
+    def address(self):
+        """
+        Returns the address the server is listening on.
+        """
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        """
+        Stops accepting connections and stops the batcher, the requests still waiting for
+        their prediction receive an error response.
+        """
+        self._server.close()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+        # fail the queued requests and wait for their error responses to be written
+        error = ConnectionError("server closed")
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            _fail_requests([future], error)
+        await asyncio.gather(*self._requests)
+        await self._server.wait_closed()
+
+    def stats(self) -> dict:
+        """
+        Returns the batch size distribution and the server-side latency percentiles.
+
+        Returns:
+            dict: The number of 'batches', the 'batch_sizes' histogram (count of batches by size),
+                the 'mean_batch' size and the latency 'p50_us' and 'p99_us' of the requests.
+        """
+        sizes = np.array(self._batch_sizes, dtype=int)
+        counts = np.bincount(sizes, minlength=self._max_batch + 1)
+        ret = {
+            "batches": len(sizes),
+            "batch_sizes": counts[1:].tolist(),
+            "mean_batch": float(np.mean(sizes)) if len(sizes) > 0 else 0.0,
+        }
+        ret.update(_latency_stats(self._latencies))
+        return ret
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                request_id, window = await _read_message(reader)
+                ws = self._window_config.ws
+                if window.shape[0] != ws:
+                    _logger.warning(
+                        f"request {request_id} has {window.shape[0]} values, expected {ws}"
+                    )
+                    _write_error(writer, request_id)
+                    continue
+
+                # keep a reference to the task, the event loop only holds a weak one
+                task = asyncio.create_task(
+                    self._serve_request(writer, request_id, window)
+                )
+                self._requests.add(task)
+                task.add_done_callback(self._requests.discard)
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_request(self, writer, request_id: int, window: np.ndarray):
+        arrival = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((window, future))
+        try:
+            y_pred = await future
+        except Exception:
+            if not writer.is_closing():
+                _write_error(writer, request_id)
+            return
+
+        self._latencies.append(time.perf_counter() - arrival)
+        if not writer.is_closing():
+            _write_message(writer, request_id, y_pred)
+
+    async def _run_batches(self):
+        batch = []
+        try:
+            await self._batch_loop(batch)
+        except asyncio.CancelledError:
+            # the batch being collected or predicted when the server is closed
+            _fail_requests(
+                [future for _, future in batch], ConnectionError("server closed")
+            )
+            raise
+
+    async def _batch_loop(self, batch: list):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch.clear()
+            batch.append(await self._queue.get())
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                x = np.stack([window for window, _ in batch]).reshape(
+                    (len(batch), self._window_config.ws, 1)
+                )
+                y_pred = await loop.run_in_executor(None, self._predictor.predict, x)
+            except Exception as e:
+                _logger.error(f"batch of {len(batch)} windows failed: {e}")
+                _fail_requests([future for _, future in batch], e)
+                continue
+
+            self._batch_sizes.append(len(batch))
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(y_pred[i])
+
+
+class PredictionClient:
+    """
+    Asyncio client of a `PredictionServer`.
+
+    Many predictions can be in flight at the same time on a single connection,
+    responses are matched to their requests by id.
+    """
+
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._receiver = None
+        self._pending = {}
+        self._next_id = 0
+        self._latencies = []
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """
+        Connects to a server on a TCP port or, when `path` is given, on a Unix socket.
+
+        Parameters:
+            host (str, optional): TCP host. Default is '127.0.0.1'.
+            port (int, optional): TCP port. Default is 0.
+            path (str, optional): Path of the Unix socket. Default is None.
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._receiver = asyncio.create_task(self._receive())
+
+    async def close(self):
+        """
+        Closes the connection.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+    async def predict(self, window: np.ndarray) -> np.ndarray:
+        """
+        Requests the prediction of a single window.
+
+        Parameters:
+            window (np.ndarray): The window, with ws values.
+
+        Returns:
+            np.ndarray: The predicted values with shape (ts,).
+
+        Raises:
+            Exception: If the server could not predict the window.
+        """
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) % (1 << 32)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        start = time.perf_counter()
+        _write_message(self._writer, request_id, window)
+        await self._writer.drain()
+        y_pred = await future
+        self._latencies.append(time.perf_counter() - start)
+        return y_pred
+
+    def stats(self) -> dict:
+        """
+        Returns the client-side latency percentiles, including the network round trip.
+        """
+        return _latency_stats(self._latencies)
+
+    async def _receive(self):
+        try:
+            while True:
+                request_id, values = await _read_message(self._reader)
+                future = self._pending.pop(request_id, None)
+                if future is None:
+                    _logger.warning(f"response to unknown request {request_id}")
+                    continue
+                if future.done():
+                    # the caller stopped waiting (e.g. timed out)
+                    continue
+                if values.shape[0] == 0:
+                    future.set_exception(
+                        Exception(f"server failed to predict request {request_id}")
+                    )
+                else:
+                    future.set_result(values)
+        except asyncio.IncompleteReadError:
+            _fail_requests(
+                list(self._pending.values()),
+                ConnectionError("connection closed by the server"),
+            )
+            self._pending.clear()
@@ -0,0 +1,379 @@
+from . import logger
+from . import utils
+from .dataset import Dataset
+from .dataset_loader import DatasetLoader
+from .progress import ProgressBar
+from .predictors.registry import create_predictor
+from .techniques import dlbdc, dlds
+from .techniques.trace import get_trace_path
+from .window import WindowConfig
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import itertools
+import multiprocessing
+
+_logger = logger.get_logger(__name__)
+
+
+@dataclass
+class TechniqueSpec:
+    """
+    A technique simulated for every point of a sweep, with the predictor it uses.
+
+    Attributes:
+        technique (str): Name of the technique, one of ['dlbdc', 'dlds'].
+        realign (str): Realignment strategy, as the parameter of `simulate`.
+        predictor (str): Name of the predictor in the registry.
+        predictor_kwargs (dict): Keyword arguments of the predictor constructor.
+        trained (bool): Whether the predictor loads a trained model, in which case the models path,
+            the dataset name, the window configuration and the seed are also passed to its constructor.
+        alpha (float): Scaling factor of the realignment strategy.
+        window_config (WindowConfig): Fixed window configuration, None to use the one of the sweep point.
+    """
+
+    technique: str
+    realign: str
+    predictor: str
+    predictor_kwargs: dict = field(default_factory=dict)
+    trained: bool = False
+    alpha: float = 1.0
+    window_config: WindowConfig = None
+
+
+@dataclass
+class SimulationJob:
+    """
+    A single simulation of a sweep.
+    """
+
+    dataset_name: str
+    dataset_loader: DatasetLoader
+    dataset_path: str
+    models_path: str
+    seed: int
+    window_config: WindowConfig
+    error: int
+    spec: TechniqueSpec
+    traces_path: str = None
+
+
+def expand_jobs(
+    dataset_names: list[tuple[str, DatasetLoader]],
+    dataset_path: str,
+    models_path: str,
+    seeds: list[int],
+    ws_list: list[int],
+    ts_list: list[int],
+    errors: list[int],
+    techniques: list[TechniqueSpec],
+    traces_path: str = None,
+) -> list[SimulationJob]:
+    """
+    Expands a sweep into its jobs, ordered as the nested loops dataset x seed x ws x ts x error x technique.
+
+    Parameters:
+        dataset_names (list): List of (dataset name, loader) pairs.
+        dataset_path (str): Base path of the datasets.
+        models_path (str): Base path of the trained models.
+        seeds (list[int]): Seeds used to split the datasets.
+        ws_list (list[int]): Window sizes.
+        ts_list (list[int]): Numbers of predicted time steps.
+        errors (list[int]): Allowed relative errors (percentage).
+        techniques (list[TechniqueSpec]): Techniques simulated for every point.
+        traces_path (str, optional): Base path where the trace of each job is saved, None to not record them. Default is None.
+
+    Returns:
+        list[SimulationJob]: The jobs of the sweep.
+    """
+    jobs = []
+    for (name, loader), seed, ws, ts, error, spec in itertools.product(
+        dataset_names, seeds, ws_list, ts_list, errors, techniques
+    ):
+        wc = (
+            spec.window_config
+            if spec.window_config is not None
+            else WindowConfig(ws, ts)
+        )
+        jobs.append(
+            SimulationJob(
+                name,
+                loader,
+                dataset_path,
+                models_path,
+                seed,
+                wc,
+                error,
+                spec,
+                traces_path,
+            )
+        )
+    return jobs
+
+
+# datasets and predictors of a worker process, reused across its jobs
+_datasets = {}
+_predictors = {}
+
+
+def _get_dataset(job: SimulationJob) -> Dataset:
+    key = (job.dataset_name, job.dataset_path)
+    if key not in _datasets:
+        _datasets[key] = Dataset(
+            name=job.dataset_name,
+            base_path=job.dataset_path,
+            loader=job.dataset_loader,
+            smooth=None,
+        )
+    return _datasets[key]
+
+
+def _get_predictor(job: SimulationJob, dataset: Dataset):
+    spec = job.spec
+    kwargs = dict(spec.predictor_kwargs)
+    if spec.trained:
+        kwargs.update(
+            models_path=job.models_path,
+            dataset_name=dataset.name(),
+            window_config=job.window_config,
+            seed=job.seed,
+        )
+
+    # predictors are built once per worker, and brought back to their initial state for each job
+    key = (spec.predictor, repr(sorted(kwargs.items())))
+    if key not in _predictors:
+        _predictors[key] = create_predictor(spec.predictor, **kwargs)
+    predictor = _predictors[key]
+    predictor.reset()
+    return predictor
+
+
+def run_job(job: SimulationJob) -> dict:
+    """
+    Runs the simulation of a job without saving its metrics, only its trace when the job has a traces path.
+
+    Parameters:
+        job (SimulationJob): The job to run.
+
+    Returns:
+        dict: The simulation metrics, as saved in `simulate.csv`.
+
+    Raises:
+        Exception: If the technique is unknown.
+    """
+    match job.spec.technique:
+        case "dlbdc":
+            simulate = dlbdc.simulate
+        case "dlds":
+            simulate = dlds.simulate
+        case _:
+            _logger.fatal(f"unknown technique '{job.spec.technique}'")
+            raise Exception(f"unknown technique '{job.spec.technique}'")
+
+    dataset = _get_dataset(job)
+    predictor = _get_predictor(job, dataset)
+    trace_path = None
+    if job.traces_path is not None:
+        trace_path = get_trace_path(
+            job.traces_path,
+            job.spec.technique,
+            dataset.name(),
+            predictor.name(),
+            job.window_config,
+            job.seed,
+            job.error,
+            job.spec.realign,
+            job.spec.alpha,
+        )
+
+    return simulate(
+        dataset=dataset,
+        output_path=None,
+        predictor=predictor,
+        window_config=job.window_config,
+        error=job.error,
+        seed=job.seed,
+        realign=job.spec.realign,
+        alpha=job.spec.alpha,
+        show_progress=False,
+        trace_path=trace_path,
+    )
+
+
+def _describe(job: SimulationJob) -> str:
+    return (
+        f"{job.spec.technique} {job.spec.realign} '{job.spec.predictor}' on "
+        f"'{job.dataset_name}' (seed={job.seed}, {job.window_config}, error={job.error})"
+    )
+
+
+def _run_job_safely(job: SimulationJob) -> dict:
+    """
+    Runs a job as `run_job`, logging its failure instead of raising it.
+
+    Returns:
+        dict: The simulation metrics, None if the job failed.
+    """
+    try:
+        return run_job(job)
+    except Exception as e:
+        _logger.error(f"job {_describe(job)} failed: {e}")
+        return None
+
+
+def _group_key(job: SimulationJob):
+    """
+    Returns the key of the jobs that can be simulated together by `dlbdc.simulate_sweep`,
+    None for the jobs that are always run alone.
+    """
+    spec = job.spec
+    if spec.technique != "dlbdc" or job.traces_path is not None:
+        return None
+    # the predictions of a cache depend on the windows of the previous steps of its run
+    if spec.predictor == "cached":
+        return None
+    return (
+        job.dataset_name,
+        job.dataset_path,
+        job.models_path,
+        job.seed,
+        job.window_config.ws,
+        job.window_config.ts,
+        spec.predictor,
+        repr(sorted(spec.predictor_kwargs.items())),
+        spec.trained,
+    )
+
+
+def group_jobs(jobs: list[SimulationJob]) -> list[list[int]]:
+    """
+    Groups the DLBDC jobs differing only in their error, realignment and alpha, so that
+    their predictor runs once over the test data for all of them.
+
+    Parameters:
+        jobs (list[SimulationJob]): Jobs of a sweep.
+
+    Returns:
+        list[list[int]]: Indices of the jobs of each group, ordered by their first job.
+    """
+    groups = []
+    keyed = {}
+    for i, job in enumerate(jobs):
+        key = _group_key(job)
+        if key is None:
+            groups.append([i])
+        elif key in keyed:
+            keyed[key].append(i)
+        else:
+            keyed[key] = [i]
+            groups.append(keyed[key])
+    return groups
+
+
+def run_group(jobs: list[SimulationJob]) -> list[dict]:
+    """
+    Runs a group of jobs returned by `group_jobs` without saving their metrics.
+
+    Groups of many jobs run in lockstep with `dlbdc.simulate_sweep`. Jobs whose predictor
+    is stateful or collects counters (e.g. cache hits), and groups whose sweep fails, are
+    run one at a time. A failing job is logged and does not stop the other jobs.
+
+    Parameters:
+        jobs (list[SimulationJob]): Jobs of the group.
+
+    Returns:
+        list[dict]: The simulation metrics of each job, None for the jobs that failed.
+    """
+    if len(jobs) > 1:
+        try:
+            dataset = _get_dataset(jobs[0])
+            predictor = _get_predictor(jobs[0], dataset)
+            if predictor.get_state() is None and len(predictor.counters()) == 0:
+                return dlbdc.simulate_sweep(
+                    dataset=dataset,
+                    output_path=None,
+                    predictor=predictor,
+                    window_config=jobs[0].window_config,
+                    configs=[
+                        (job.error, job.spec.realign, job.spec.alpha) for job in jobs
+                    ],
+                    seed=jobs[0].seed,
+                    show_progress=False,
+                )
+        except Exception as e:
+            _logger.error(
+                f"sweep of {len(jobs)} jobs like {_describe(jobs[0])} failed, "
+                f"run them one at a time: {e}"
+            )
+    return [_run_job_safely(job) for job in jobs]
+
+
+def run_sweep(jobs: list[SimulationJob], output_path: str, max_workers: int = None):
+    """
+    Runs the jobs of a sweep on a pool of processes and saves their metrics to `simulate.csv`.
+
+    Jobs are run in the groups returned by `group_jobs`, so the DLBDC jobs sharing a
+    predictor predict the test data once for all their errors.
+    Each worker keeps its own model cache, datasets and predictors across the jobs it runs.
+    Rows are written only by the calling process, in the order of the jobs as soon as all
+    the previous jobs have finished, so the output matches a serial run row for row.
+    Failed jobs are logged and leave no row, the rows of the other jobs are still written.
+    Workers are spawned rather than forked, so they never inherit a TensorFlow runtime
+    initialized in this process, and the calling script must guard its code with
+    `if __name__ == "__main__":`.
+
+    Parameters:
+        jobs (list[SimulationJob]): Jobs to run, as returned by `expand_jobs`.
+        output_path (str): Directory where the simulation metrics are saved.
+        max_workers (int, optional): Number of worker processes, 0 runs the jobs serially in this process. Default is the number of CPUs.
+    """
+    _logger.info(f"run sweep of {len(jobs)} jobs with {max_workers = }")
+    if len(jobs) == 0:
+        return
+    groups = group_jobs(jobs)
+    _logger.info(f"jobs grouped into {len(groups)} runs")
+    progress = ProgressBar(len(jobs))
+    progress.update(0)
+
+    results = {}
+    next_row = 0
+    done = 0
+    failed = 0
+
+    def collect(group: list[int], rows: list[dict]):
+        nonlocal next_row, done, failed
+        for i, row in zip(group, rows):
+            results[i] = row
+        done += len(group)
+        progress.update(done)
+
+        # write the rows of the finished prefix of the jobs
+        while next_row in results:
+            row = results.pop(next_row)
+            if row is None:
+                failed += 1
+            else:
+                utils.save_metrics("simulate.csv", output_path, row)
+            next_row += 1
+
+    if max_workers == 0:
+        for group in groups:
+            collect(group, run_group([jobs[i] for i in group]))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                executor.submit(run_group, [jobs[i] for i in group]): group
+                for group in groups
+            }
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    _logger.error(f"worker running {len(group)} jobs failed: {e}")
+                    rows = [None] * len(group)
+                collect(group, rows)
+
+    if failed > 0:
+        _logger.warning(f"{failed} of {len(jobs)} jobs failed, see the errors above")
@@ -0,0 +1,77 @@
+from ..progress import ProgressBar
+from ..predictors.predictor import BasePredictor
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import numpy as np
+
+
+def _run_chunk(run_stream, chunk: np.ndarray, predictor: BasePredictor) -> dict:
+    predictor.reset()
+    return run_stream(chunk, predictor)
+
+
+def run_chunks(
+    run_stream,
+    test_chunks: np.ndarray,
+    predictor: BasePredictor,
+    show_progress: bool = True,
+    max_workers: int = 0,
+) -> list[dict]:
+    """
+    Simulates every test chunk independently, starting each one from the initial state of the predictor.
+
+    Worker processes are spawned rather than forked, so a runtime already initialized in
+    this process (e.g. TensorFlow by an `MLPredictor`) is never copied into them. Spawned
+    workers import the main module again, so scripts using them must guard their code
+    with `if __name__ == "__main__":`.
+
+    Parameters:
+        run_stream (callable): Function simulating a 1-D stream with a predictor and returning its counters.
+            It is sent to the worker processes, so it must be picklable (e.g. a `functools.partial` of a module function).
+        test_chunks (np.ndarray): Test chunks with shape (M, chunk_size, 1), as returned by `train_test_split`.
+        predictor (BasePredictor): Predictor, copied into each worker process.
+        show_progress (bool, optional): Whether to print a progress bar over the chunks. Default is True.
+        max_workers (int, optional): Number of worker processes, 0 runs the chunks serially in this process and None uses one for each CPU. Default is 0.
+
+    Returns:
+        list[dict]: The counters of each chunk, in the order of the chunks.
+    """
+    chunks = [test_chunks[i].reshape(-1) for i in range(test_chunks.shape[0])]
+    progress = ProgressBar(len(chunks)) if show_progress else None
+
+    if max_workers == 0:
+        results = []
+        for i, chunk in enumerate(chunks):
+            results.append(_run_chunk(run_stream, chunk, predictor))
+            if progress is not None:
+                progress.update(i + 1)
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_run_chunk, run_stream, chunk, predictor)
+            for chunk in chunks
+        ]
+        for done, _ in enumerate(as_completed(futures)):
+            if progress is not None:
+                progress.update(done + 1)
+    return [future.result() for future in futures]
+
+
+def merge_counters(counters: list[dict]) -> dict:
+    """
+    Sums the counters of many chunks, in the order of the chunks.
+
+    Parameters:
+        counters (list[dict]): Counters of each chunk.
+
+    Returns:
+        dict: The total counters.
+    """
+    total = dict(counters[0])
+    for chunk_counters in counters[1:]:
+        for key, value in chunk_counters.items():
+            total[key] += value
+    return total
@@ -1,10 +1,10 @@
 from .. import logger
 from ..dataset import Dataset
-from ..window import WindowConfig
+from ..window import WindowConfig, RingWindow
 from ..progress import ProgressBar
 from ..predictors.predictor import BasePredictor
-from ..predictors.kf_predictor import KFPredictor
 from .. import utils
+from . import engine
 import numpy as np
 
 _logger = logger.get_logger(__name__)
@@ -19,14 +19,18 @@ def simulate(
     seed: int,
     realign: str,
     alpha: float = 1.0,
-):
+    show_progress: bool = True,
+    per_chunk: bool = False,
+    max_workers: int = 0,
+    trace_path: str = None,
+) -> dict:
     """
     Run a simulation of the DLBDC algorithm on a given dataset.
 
     Parameters
     ----------
     dataset (Dataset): Dataset to use for the simulation.
-    output_path (str): Directory where the simulation metrics are saved.
+    output_path (str): Directory where the simulation metrics are saved, None to only return them.
     predictor (BasePredictor): Predictor.
     window_config (WindowConfig): Window configuration parameters.
     error (int): Allowed relative error (percentage).
@@ -34,15 +38,126 @@ def simulate(
     realign (str): Realignment strategy for buffer update.
         Can be one of: ["simple-append", "scaled-distance"]
     alpha (float): Scaling factor for the "scaled-distance" strategy. Default is 1.0.
+    show_progress (bool): Whether to print a progress bar. Default is True.
+    per_chunk (bool): Whether to simulate each test chunk independently, re-seeding the buffer and
+        resetting the predictor at its start. The counters of each chunk are saved in `simulate_chunks.csv`
+        and their sum in `simulate.csv`. Default is False.
+    max_workers (int): Number of worker processes simulating the chunks in `per_chunk` mode,
+        0 runs them serially and None uses one for each CPU. Default is 0.
+    trace_path (str): Path of a compressed `.npz` file where the real value, the prediction, the decision,
+        the newest buffer value and the errors of every step are saved, see `trace.get_trace_path`.
+        None does not record the trace. Default is None.
+
+    Returns
+    -------
+    dict: The simulation metrics, as saved in `simulate.csv`.
     """
-    _logger.info(f"simulate technique using parameters:")
+    return engine.simulate(
+        technique="DLBDC",
+        policy=policy(window_config, error, realign, alpha),
+        dataset=dataset,
+        output_path=output_path,
+        predictor=predictor,
+        window_config=window_config,
+        error=error,
+        seed=seed,
+        realign=realign,
+        alpha=alpha,
+        show_progress=show_progress,
+        per_chunk=per_chunk,
+        max_workers=max_workers,
+        trace_path=trace_path,
+    )
+
+
+def policy(
+    window_config: WindowConfig, error: int, realign: str, alpha: float = 1.0
+) -> engine.Policy:
+    """
+    Returns the behaviour of the DLBDC algorithm: one value is predicted and checked at
+    each step, and the predictor is updated with the newest value of the buffer.
+
+    Parameters:
+        window_config (WindowConfig): Window configuration parameters.
+        error (int): Allowed relative error (percentage).
+        realign (str): Realignment strategy, one of ["simple-append", "scaled-distance"].
+        alpha (float, optional): Scaling factor for the "scaled-distance" strategy. Default is 1.0.
+
+    Returns:
+        engine.Policy: The policy of the simulation engine.
+
+    Raises:
+        Exception: If the realignment strategy is unknown.
+    """
+    match realign:
+        case "simple-append":
+            realign_fn = engine.SimpleAppend()
+        case "scaled-distance":
+            realign_fn = engine.ScaledDistance(alpha)
+        case _:
+            _logger.fatal(f"unknown realign parameter '{realign}'")
+            raise Exception(f"unknown realign parameter '{realign}'")
+
+    return engine.Policy(
+        horizon=1,
+        tail=0,
+        acceptance=engine.RelativeErrorTest(error),
+        realign=realign_fn,
+        update_predictor=True,
+    )
+
+
+def simulate_sweep(
+    dataset: Dataset,
+    output_path: str,
+    predictor: BasePredictor,
+    window_config: WindowConfig,
+    configs: list[tuple[int, str, float]],
+    seed: int,
+    show_progress: bool = True,
+) -> list[dict]:
+    """
+    Run the DLBDC algorithm for many (error, realign, alpha) configurations in lockstep.
+
+    Every configuration keeps its own buffer, all the buffers advance together over the
+    same test data and are predicted with a single `predict` call per step, so a sweep
+    costs about one simulation. The metrics saved for each configuration are the same of
+    `simulate`, provided the predictions of a window do not depend on the other windows
+    of the batch. Stateful predictors are not supported, since they would have to follow
+    a different sequence of values for each configuration.
+
+    Parameters
+    ----------
+    dataset (Dataset): Dataset to use for the simulation.
+    output_path (str): Directory where the simulation metrics are saved, None to only return them.
+    predictor (BasePredictor): Stateless predictor.
+    window_config (WindowConfig): Window configuration parameters.
+    configs (list): List of (error, realign, alpha) configurations, as the parameters of `simulate`.
+    seed (int): Random seed used to split the dataset.
+    show_progress (bool): Whether to print a progress bar. Default is True.
+
+    Returns
+    -------
+    list[dict]: The simulation metrics of each configuration, as saved in `simulate.csv`.
+    """
+    _logger.info(f"simulate technique sweep using parameters:")
     _logger.info(f"  dataset       = '{dataset.name()}'")
     _logger.info(f"  predictor     = '{predictor.name()}'")
     _logger.info(f"  {window_config = }")
-    _logger.info(f"  {error         = }")
+    _logger.info(f"  {configs       = }")
     _logger.info(f"  {seed          = }")
-    _logger.info(f"  {realign       = }")
-    _logger.info(f"  {alpha         = }")
+
+    if predictor.get_state() is not None:
+        _logger.fatal(f"cannot sweep stateful predictor '{predictor.name()}'")
+        raise Exception(f"cannot sweep stateful predictor '{predictor.name()}'")
+    for _, realign, _ in configs:
+        if realign not in ["simple-append", "scaled-distance"]:
+            _logger.fatal(f"unknown realign parameter '{realign}'")
+            raise Exception(f"unknown realign parameter '{realign}'")
+
+    errors = np.array([error for error, _, _ in configs])
+    scaled = np.array([realign == "scaled-distance" for _, realign, _ in configs])
+    alphas = np.array([alpha for _, _, alpha in configs], dtype=np.float64)
 
     # load simulation data
     _, test_data = dataset.train_test_split(type="random", seed=seed)
@@ -50,81 +165,58 @@ def simulate(
     _logger.debug(f"test data shape: {test_data.shape}")
 
     # create progressbar
-    progress = ProgressBar(test_data.shape[0])
+    progress = ProgressBar(test_data.shape[0]) if show_progress else None
 
-    # initialize buffer with the first few samples
-    buffer = test_data[: window_config.ws].reshape((1, window_config.ws, 1)).copy()
-    _logger.debug(f"buffer shape: {buffer.shape}")
+    # initialize a buffer for each configuration with the first few samples
+    window = RingWindow(window_config.ws, streams=len(configs), dtype=test_data.dtype)
+    window.fill(test_data[: window_config.ws])
+    _logger.debug(f"buffer shape: {window.view().shape}")
 
-    # initialize metrics counters
+    # initialize metrics counters of each configuration
     sensing_count = window_config.ws
     inferences_count = 0
-    send_count = window_config.ws
-    skip_count = 0
-    error_acc = 0
-    error_percent_acc = 0
+    send_count = np.full(len(configs), window_config.ws)
+    skip_count = np.zeros(len(configs), dtype=int)
+    error_acc = np.zeros(len(configs))
+    error_percent_acc = np.zeros(len(configs))
 
     # simulate
     idx = window_config.ws
     while idx < test_data.shape[0]:
-        progress.update(idx)
+        if progress is not None:
+            progress.update(idx)
 
         # 1. read real value from current iteration
         y_real = test_data[idx]
-        # _logger.debug(f"predicted value: {y_real}")
         sensing_count += 1
 
-        # 2. predict value from current iteration
-        y_pred = predictor.predict(buffer)[0][0]
-        # _logger.debug(f"predicted value: {y_pred}")
+        # 2. predict the value of every configuration at once
+        y_pred = predictor.predict(window.view())[:, 0]
         inferences_count += 1
 
-        # 3. compute error threshold
-        eps = (y_real * error) / 100
-        if y_pred >= (y_real - eps) and y_pred <= (y_real + eps):
-            # 4.1. skip sending to the server
-            skip_count += 1
-            error_acc += abs(y_real - y_pred)
-            error_percent_acc += abs(y_real - y_pred) / y_real
-
-            # 5. update buffer with predicted value
-            buffer = np.roll(buffer, -1)
-            buffer[:, -1] = y_pred
-        else:
-            match realign:
-                case "simple-append":
-                    # send to the server
-                    send_count += 1
-                    # update buffer with predicted value
-                    buffer = np.roll(buffer, -1)
-                    buffer[:, -1] = y_real
-                case "scaled-distance":
-                    # send to the server
-                    send_count += 1
-                    # compute the scaled distance between the last point in the buffer and the new measured value
-                    p1 = buffer[0][-1][0]
-                    p2 = y_real
-                    delta = (p2 - p1) * alpha
-
-                    # update buffer with scaled distance
-                    buffer = np.roll(buffer, -1)
-                    buffer[:, -1] = p1 + delta
-                    # _logger.error(f"{p1=} {p2=} {delta=} {p1+delta=}")
-                case _:
-                    _logger.fatal(f"unknown realign parameter '{realign}'")
-                    raise Exception(f"unknown realign parameter '{realign}'")
-
-        # 6. call update with the latest value inside the buffer
-        predictor.update(buffer[:, -1])
-
-        # 7. move to next iteration
+        # 3. compute error thresholds
+        eps = (y_real * errors) / 100
+        skip = (y_pred >= (y_real - eps)) & (y_pred <= (y_real + eps))
+
+        # 4. update counters, skipped values are not sent to the server
+        skip_count += skip
+        send_count += ~skip
+        error_acc[skip] += abs(y_real - y_pred[skip])
+        error_percent_acc[skip] += abs(y_real - y_pred[skip]) / y_real
+
+        # 5. update buffers with the predicted value or the realigned real value
+        p1 = window.last()
+        realigned = np.where(scaled, p1 + (y_real - p1) * alphas, y_real)
+        window.push(np.where(skip, y_pred, realigned))
+
+        # 6. move to next iteration
         idx += 1
 
-    # save metrics
-    utils.save_metrics(
-        "simulate.csv",
-        output_path,
-        {
+    rows = []
+    for k, (error, realign, alpha) in enumerate(configs):
+        # accumulators stay the integer 0 without skips, as in `simulate`
+        skipped = skip_count[k] > 0
+        metrics = {
             "dataset": dataset.name(),
             "seed": seed,
             "predictor_name": predictor.name(),
@@ -136,9 +228,14 @@ def simulate(
             "tot_samples": test_data.shape[0],
             "sensing_count": sensing_count,
             "inferences_count": inferences_count,
-            "send_count": send_count,
-            "skip_count": skip_count,
-            "error_acc": error_acc,
-            "error_percent_acc": error_percent_acc,
-        },
-    )
+            "send_count": int(send_count[k]),
+            "skip_count": int(skip_count[k]),
+            "error_acc": error_acc[k] if skipped else 0,
+            "error_percent_acc": error_percent_acc[k] if skipped else 0,
+        }
+        rows.append(metrics)
+
+        # save metrics
+        if output_path is not None:
+            utils.save_metrics("simulate.csv", output_path, metrics)
+    return rows
@@ -1,10 +1,8 @@
 from .. import logger
 from ..dataset import Dataset
 from ..window import WindowConfig
-from ..progress import ProgressBar
 from ..predictors.predictor import BasePredictor
-from .. import utils
-import numpy as np
+from . import engine
 
 _logger = logger.get_logger(__name__)
 
@@ -18,14 +16,18 @@ def simulate(
     seed: int,
     realign: str,
     alpha: float = 1.0,
-):
+    show_progress: bool = True,
+    per_chunk: bool = False,
+    max_workers: int = 0,
+    trace_path: str = None,
+) -> dict:
     """
     Run a simulation of the DLDS algorithm on a given dataset.
 
     Parameters
     ----------
     dataset (Dataset): Dataset to use for the simulation.
-    output_path (str): Directory where the simulation metrics are saved.
+    output_path (str): Directory where the simulation metrics are saved, None to only return them.
     predictor (BasePredictor): Predictor.
     window_config (WindowConfig): Window configuration parameters.
     error (int): Allowed relative error (percentage).
@@ -33,124 +35,69 @@ def simulate(
     realign (str): Realignment strategy for buffer update.
         Can be one of: ["simple-append", "lerp"]
     alpha (float): Scaling factor for the "scaled-distance" strategy. Default is 1.0.
+    show_progress (bool): Whether to print a progress bar. Default is True.
+    per_chunk (bool): Whether to simulate each test chunk independently, re-seeding the buffer and
+        resetting the predictor at its start. The counters of each chunk are saved in `simulate_chunks.csv`
+        and their sum in `simulate.csv`. Default is False.
+    max_workers (int): Number of worker processes simulating the chunks in `per_chunk` mode,
+        0 runs them serially and None uses one for each CPU. Default is 0.
+    trace_path (str): Path of a compressed `.npz` file where the real value, the prediction, the decision,
+        the newest buffer value and the errors of every step are saved, see `trace.get_trace_path`.
+        None does not record the trace. Default is None.
+
+    Returns
+    -------
+    dict: The simulation metrics, as saved in `simulate.csv`.
     """
-    _logger.info(f"simulate DLDS technique using parameters:")
-    _logger.info(f"  dataset       = '{dataset.name()}'")
-    _logger.info(f"  predictor     = '{predictor.name()}'")
-    _logger.info(f"  {window_config = }")
-    _logger.info(f"  {error         = }")
-    _logger.info(f"  {seed          = }")
-    _logger.info(f"  {realign       = }")
-    _logger.info(f"  {alpha         = }")
-
-    # load simulation data
-    _, test_data = dataset.train_test_split(type="random", seed=seed)
-    test_data = test_data.reshape((test_data.shape[0] * test_data.shape[1]))
-    _logger.debug(f"test data shape: {test_data.shape}")
-
-    # create progressbar
-    progress = ProgressBar(test_data.shape[0])
-
-    # initialize buffer with the first few samples
-    buffer = test_data[: window_config.ws].reshape((1, window_config.ws, 1)).copy()
-    _logger.debug(f"buffer shape: {buffer.shape}")
-
-    # initialize metrics counters
-    sensing_count = window_config.ws
-    inferences_count = 0
-    send_count = window_config.ws
-    skip_count = 0
-    error_acc = 0
-    error_percent_acc = 0
-
-    # simulate
-    # 0. start the simulation at ws
-    idx = window_config.ws
-    while idx + window_config.ts < test_data.shape[0]:
-        progress.update(idx)
-
-        # 1. predict values from buffer
-        y_pred = predictor.predict(buffer)[0]
-        y_pred = y_pred[: window_config.ts]
-        inferences_count += 1
-
-        # 2. compute individual errors of each predicted value
-        pred_error_list = []
-        pred_error_percent_list = []
-        for i in range(window_config.ts):
-            # compute error between predicted value and real value
-            actual_val = test_data[idx + i]
-            pred_error_list.append(abs(actual_val - y_pred[i]))
-            pred_error_percent_list.append(abs(actual_val - y_pred[i]) / actual_val)
-
-        # 3. read last value at ts-1
-        y_real = test_data[idx + window_config.ts - 1]
-        sensing_count += 1
-
-        # 4. compute error threshold
-        eps = (y_real * error) / 100
-        if y_pred[-1] >= (y_real - eps) and y_pred[-1] <= (y_real + eps):
-            # skip sending to the server
-            skip_count += window_config.ts
-            error_acc += sum(pred_error_list)
-            error_percent_acc += sum(pred_error_percent_list)
+    return engine.simulate(
+        technique="DLDS",
+        policy=policy(window_config, error, realign, alpha),
+        dataset=dataset,
+        output_path=output_path,
+        predictor=predictor,
+        window_config=window_config,
+        error=error,
+        seed=seed,
+        realign=realign,
+        alpha=alpha,
+        show_progress=show_progress,
+        per_chunk=per_chunk,
+        max_workers=max_workers,
+        trace_path=trace_path,
+    )
 
-            # update buffer with predicted values
-            for i in range(window_config.ts):
-                buffer = np.roll(buffer, -1)
-                buffer[:, -1] = y_pred[i]
-        else:
-            # send to the server
-            send_count += 1
-            skip_count += window_config.ts - 1
-            error_acc += sum(pred_error_list[:-1])
-            error_percent_acc += sum(pred_error_percent_list[:-1])
 
-            match realign:
-                case "simple-append":
-                    # update buffer by putting ts-1 pred values and the last real value
-                    for i in range(window_config.ts):
-                        buffer = np.roll(buffer, -1)
-                        buffer[:, -1] = y_pred[i]
-                    buffer[:, -1] = y_real
-                case "lerp":
-                    # update buffer by putting ts pred values
-                    for i in range(window_config.ts):
-                        buffer = np.roll(buffer, -1)
-                        buffer[:, -1] = y_pred[i]
-                    buffer[:, -1] = y_real
+def policy(
+    window_config: WindowConfig, error: int, realign: str, alpha: float = 1.0
+) -> engine.Policy:
+    """
+    Returns the behaviour of the DLDS algorithm: `ts` values are predicted at each step and
+    only the last one is checked against its real value.
 
-                    p1 = buffer[0][0][0]
-                    p2 = buffer[0][-1][0]
-                    omega = (p2 - p1) / (window_config.ws - 1)
-                    for i in range(window_config.ws):
-                        buffer[:, i] = p1 + i * omega
-                case _:
-                    _logger.fatal(f"unknown realign parameter '{realign}'")
-                    raise Exception(f"unknown realign parameter '{realign}'")
+    Parameters:
+        window_config (WindowConfig): Window configuration parameters.
+        error (int): Allowed relative error (percentage).
+        realign (str): Realignment strategy, one of ["simple-append", "lerp"].
+        alpha (float, optional): Unused, kept for the same interface of the DLBDC policy. Default is 1.0.
 
-        # 6. move to the next iteration
-        idx += window_config.ts
+    Returns:
+        engine.Policy: The policy of the simulation engine.
 
-    # save metrics
-    utils.save_metrics(
-        "simulate.csv",
-        output_path,
-        {
-            "dataset": dataset.name(),
-            "seed": seed,
-            "predictor_name": predictor.name(),
-            "window_size": window_config.ws,
-            "time_steps": window_config.ts,
-            "error": error,
-            "realign": realign,
-            "alpha": alpha,
-            "tot_samples": test_data.shape[0],
-            "sensing_count": sensing_count,
-            "inferences_count": inferences_count,
-            "send_count": send_count,
-            "skip_count": skip_count,
-            "error_acc": error_acc,
-            "error_percent_acc": error_percent_acc,
-        },
+    Raises:
+        Exception: If the realignment strategy is unknown.
+    """
+    match realign:
+        case "simple-append":
+            realign_fn = engine.SimpleAppend()
+        case "lerp":
+            realign_fn = engine.Lerp()
+        case _:
+            _logger.fatal(f"unknown realign parameter '{realign}'")
+            raise Exception(f"unknown realign parameter '{realign}'")
+
+    return engine.Policy(
+        horizon=window_config.ts,
+        tail=window_config.ts,
+        acceptance=engine.RelativeErrorTest(error),
+        realign=realign_fn,
     )
@@ -0,0 +1,424 @@
+from .. import logger
+from .. import utils
+from ..dataset import Dataset
+from ..window import WindowConfig, RingWindow
+from ..progress import ProgressBar
+from ..predictors.predictor import BasePredictor
+from ..predictors.cached_predictor import add_hit_rate
+from . import chunks
+from . import trace
+from dataclasses import dataclass
+import functools
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+
+class RelativeErrorTest:
+    """
+    Acceptance test skipping a value when the prediction is within a relative error of the real value.
+    """
+
+    def __init__(self, error: int):
+        """
+        Parameters:
+            error (int): Allowed relative error (percentage).
+        """
+        self.error = error
+
+    def bounds(self, y_real: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the lowest and highest accepted prediction of each real value.
+
+        The bounds of all the steps are computed at once before simulating, so that the
+        test of a step is a plain comparison.
+        """
+        eps = (y_real * self.error) / 100
+        return y_real - eps, y_real + eps
+
+
+class SimpleAppend:
+    """
+    Realignment appending the predicted values but the last one, replaced by the real value.
+    """
+
+    def __call__(self, window: RingWindow, y_pred: np.ndarray, y_real):
+        if y_pred.shape[0] > 1:
+            window.push_many(y_pred[:-1])
+        window.push(y_real)
+
+
+class ScaledDistance:
+    """
+    Realignment appending the predicted values but the last one, replaced by the point at
+    `alpha` times the distance between the newest value of the buffer and the real value.
+    """
+
+    def __init__(self, alpha: float):
+        """
+        Parameters:
+            alpha (float): Scaling factor of the distance.
+        """
+        self.alpha = alpha
+
+    def __call__(self, window: RingWindow, y_pred: np.ndarray, y_real):
+        if y_pred.shape[0] > 1:
+            window.push_many(y_pred[:-1])
+        p1 = window.last()[0]
+        window.push(p1 + (y_real - p1) * self.alpha)
+
+
+class Lerp(SimpleAppend):
+    """
+    Realignment appending the values as `SimpleAppend` and then replacing the buffer with
+    the line between its first and last values.
+    """
+
+    def __call__(self, window: RingWindow, y_pred: np.ndarray, y_real):
+        super().__call__(window, y_pred, y_real)
+        window.fill_linear(window.first(), window.last())
+
+
+@dataclass
+class Policy:
+    """
+    Behaviour of a technique at every step of the simulation.
+
+    Attributes:
+        horizon (int): Number of predicted values checked and consumed at each step.
+        tail (int): Number of samples at the end of the stream that are never simulated.
+        acceptance (RelativeErrorTest): Test giving the range of accepted predictions of the last real value of each step.
+        realign (callable): Buffer update applied when the values are sent, from the predicted values and the last real value.
+        update_predictor (bool): Whether the predictor is updated with the newest value of the buffer after each step.
+    """
+
+    horizon: int
+    tail: int
+    acceptance: RelativeErrorTest
+    realign: SimpleAppend
+    update_predictor: bool = False
+
+
+class StepCounters:
+    """
+    Preallocated columns with the outcome of every step of a simulation.
+
+    Only the predictions and the decisions are stored while simulating, the errors and
+    the totals are computed with array operations at the end, accumulating the errors
+    in the same order of a step by step accumulation.
+    """
+
+    def __init__(self, steps: int, horizon: int, trace: bool = False):
+        """
+        Parameters:
+            steps (int): Number of steps of the simulation.
+            horizon (int): Number of predicted values at each step.
+            trace (bool, optional): Whether to also store the newest value of the buffer after each step. Default is False.
+        """
+        self.y_pred = np.zeros((steps, horizon))
+        self.sent = np.zeros(steps, dtype=bool)
+        self.buffer_tail = np.zeros(steps) if trace else None
+
+    def _errors(
+        self, test_data: np.ndarray, starts: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the real values, the errors and the relative errors of every predicted value, with shape (steps, horizon).
+        """
+        horizon = self.y_pred.shape[1]
+        y_real = test_data[starts[:, np.newaxis] + np.arange(horizon)]
+
+        # the error of the last value of a sent step is not accumulated
+        skipped = np.ones(self.y_pred.shape, dtype=bool)
+        skipped[self.sent, -1] = False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            errors = np.where(skipped, np.abs(y_real - self.y_pred), 0.0)
+            errors_percent = np.where(
+                skipped, np.abs(y_real - self.y_pred) / y_real, 0.0
+            )
+        return y_real, errors, errors_percent
+
+    def totals(self, test_data: np.ndarray, starts: np.ndarray, ws: int) -> dict:
+        """
+        Returns the counters of the simulation, as saved in `simulate.csv`.
+
+        Parameters:
+            test_data (np.ndarray): The simulated stream.
+            starts (np.ndarray): Index of the first predicted value of each step.
+            ws (int): Size of the window, whose first values are always sent.
+        """
+        steps, horizon = self.y_pred.shape
+        sends = int(np.count_nonzero(self.sent))
+        counters = {
+            "tot_samples": test_data.shape[0],
+            "sensing_count": ws + steps,
+            "inferences_count": steps,
+            "send_count": ws + sends,
+            "skip_count": horizon * steps - sends,
+            "error_acc": 0,
+            "error_percent_acc": 0,
+        }
+        if counters["skip_count"] == 0:
+            return counters
+
+        _, errors, errors_percent = self._errors(test_data, starts)
+
+        # cumulative sums add the values one at a time, as the counters of a python loop
+        counters["error_acc"] = np.cumsum(np.cumsum(errors, axis=1)[:, -1])[-1]
+        counters["error_percent_acc"] = np.cumsum(
+            np.cumsum(errors_percent, axis=1)[:, -1]
+        )[-1]
+        return counters
+
+    def columns(self, test_data: np.ndarray, starts: np.ndarray) -> dict:
+        """
+        Returns the trace of the simulation, with one row for each step.
+
+        The errors are the ones accumulated in the counters, so they are 0 for the last
+        value of a sent step.
+
+        Parameters:
+            test_data (np.ndarray): The simulated stream.
+            starts (np.ndarray): Index of the first predicted value of each step.
+
+        Returns:
+            dict: The columns 'index', 'y_real', 'y_pred', 'sent', 'buffer_tail', 'error' and 'error_percent',
+                where the values and the errors have shape (steps, horizon).
+        """
+        y_real, errors, errors_percent = self._errors(test_data, starts)
+        return {
+            "index": starts,
+            "y_real": y_real,
+            "y_pred": self.y_pred,
+            "sent": self.sent,
+            "buffer_tail": self.buffer_tail,
+            "error": errors,
+            "error_percent": errors_percent,
+        }
+
+
+def run_stream(
+    test_data: np.ndarray,
+    predictor: BasePredictor,
+    window_config: WindowConfig,
+    policy: Policy,
+    show_progress: bool = False,
+) -> dict:
+    """
+    Simulates a technique on a 1-D stream and returns its counters.
+
+    Parameters:
+        test_data (np.ndarray): The stream to simulate.
+        predictor (BasePredictor): Predictor.
+        window_config (WindowConfig): Window configuration parameters.
+        policy (Policy): Behaviour of the technique.
+        show_progress (bool, optional): Whether to print a progress bar. Default is False.
+
+    Returns:
+        dict: The counters of the simulation and the ones collected by the predictor, as saved in `simulate.csv`.
+    """
+    counters, starts, predictor_counters = _run_steps(
+        test_data, predictor, window_config, policy, show_progress, trace=False
+    )
+    return {
+        **counters.totals(test_data, starts, window_config.ws),
+        **predictor_counters,
+    }
+
+
+def trace_stream(
+    test_data: np.ndarray,
+    predictor: BasePredictor,
+    window_config: WindowConfig,
+    policy: Policy,
+    show_progress: bool = False,
+) -> tuple[dict, dict]:
+    """
+    Simulates a technique on a 1-D stream as `run_stream`, also recording the trace of every step.
+
+    Returns:
+        tuple[dict, dict]: The counters of the simulation and its trace, as returned by `StepCounters.columns`.
+    """
+    counters, starts, predictor_counters = _run_steps(
+        test_data, predictor, window_config, policy, show_progress, trace=True
+    )
+    return (
+        {
+            **counters.totals(test_data, starts, window_config.ws),
+            **predictor_counters,
+        },
+        counters.columns(test_data, starts),
+    )
+
+
+def _run_steps(
+    test_data: np.ndarray,
+    predictor: BasePredictor,
+    window_config: WindowConfig,
+    policy: Policy,
+    show_progress: bool,
+    trace: bool,
+) -> tuple[StepCounters, np.ndarray, dict]:
+    """
+    Runs the steps of a simulation, returns the filled counters, the index of the first
+    predicted value of each step and the counters collected by the predictor during the run.
+    Raises ValueError when the predictor returns fewer values than the horizon.
+    """
+    predictor_counters = predictor.counters()
+    ws = window_config.ws
+    horizon = policy.horizon
+    starts = np.arange(ws, test_data.shape[0] - policy.tail, horizon)
+    counters = StepCounters(starts.shape[0], horizon, trace)
+
+    # create progressbar
+    progress = ProgressBar(test_data.shape[0]) if show_progress else None
+
+    # initialize buffer with the first few samples
+    window = RingWindow(ws, dtype=test_data.dtype)
+    window.fill(test_data[:ws])
+    _logger.debug(f"buffer shape: {window.view().shape}")
+
+    # resolve the policy once
+    predict = predictor.predict
+    update = predictor.update if policy.update_predictor else None
+    realign = policy.realign
+    y_real_column = test_data[starts + horizon - 1]
+    low, high = policy.acceptance.bounds(y_real_column)
+    low = low.tolist()
+    high = high.tolist()
+    y_pred_column = counters.y_pred
+    sent_column = counters.sent
+    tail_column = counters.buffer_tail
+
+    for step in range(starts.shape[0]):
+        if progress is not None:
+            progress.update(starts[step])
+
+        # 1. predict values from buffer
+        y_pred = predict(window.view())[0][:horizon]
+        if y_pred.shape[0] < horizon:
+            _logger.fatal(
+                f"predictor '{predictor.name()}' returned {y_pred.shape[0]} values, expected {horizon}"
+            )
+            raise ValueError(
+                f"predictor '{predictor.name()}' returned {y_pred.shape[0]} values, expected {horizon}"
+            )
+        y_pred_column[step] = y_pred
+
+        # 2. skip the values when the last one is close to its real value
+        if low[step] <= float(y_pred[-1]) <= high[step]:
+            if horizon == 1:
+                window.push(y_pred[0])
+            else:
+                window.push_many(y_pred)
+        else:
+            # 3. send the real value to the server
+            sent_column[step] = True
+            realign(window, y_pred, y_real_column[step])
+
+        # record the newest value of the buffer only when tracing
+        if tail_column is not None:
+            tail_column[step] = window.last()[0]
+
+        # 4. call update with the latest value inside the buffer
+        if update is not None:
+            update(window.view()[:, -1])
+
+    for key, value in predictor.counters().items():
+        predictor_counters[key] = value - predictor_counters[key]
+    return counters, starts, predictor_counters
+
+
+def simulate(
+    technique: str,
+    policy: Policy,
+    dataset: Dataset,
+    output_path: str,
+    predictor: BasePredictor,
+    window_config: WindowConfig,
+    error: int,
+    seed: int,
+    realign: str,
+    alpha: float = 1.0,
+    show_progress: bool = True,
+    per_chunk: bool = False,
+    max_workers: int = 0,
+    trace_path: str = None,
+) -> dict:
+    """
+    Runs the simulation of a technique on a given dataset, as `dlbdc.simulate` and `dlds.simulate`.
+
+    Parameters:
+        technique (str): Name of the technique, used for logging.
+        policy (Policy): Behaviour of the technique.
+        The other parameters are the ones of `dlbdc.simulate`.
+
+    Returns:
+        dict: The simulation metrics, as saved in `simulate.csv`.
+
+    Raises:
+        ValueError: If the predictor returns fewer values than the policy horizon.
+    """
+    _logger.info(f"simulate {technique} technique using parameters:")
+    _logger.info(f"  dataset       = '{dataset.name()}'")
+    _logger.info(f"  predictor     = '{predictor.name()}'")
+    _logger.info(f"  {window_config = }")
+    _logger.info(f"  {error         = }")
+    _logger.info(f"  {seed          = }")
+    _logger.info(f"  {realign       = }")
+    _logger.info(f"  {alpha         = }")
+    _logger.info(f"  {per_chunk     = }")
+    _logger.info(f"  {trace_path    = }")
+
+    # load simulation data
+    _, test_data = dataset.train_test_split(type="random", seed=seed)
+    run = functools.partial(
+        run_stream if trace_path is None else trace_stream,
+        window_config=window_config,
+        policy=policy,
+    )
+    metrics = {
+        "dataset": dataset.name(),
+        "seed": seed,
+        "predictor_name": predictor.name(),
+        "window_size": window_config.ws,
+        "time_steps": window_config.ts,
+        "error": error,
+        "realign": realign,
+        "alpha": alpha,
+    }
+
+    if per_chunk:
+        # simulate every chunk from a fresh buffer and predictor
+        _logger.debug(f"test chunks shape: {test_data.shape}")
+        results = chunks.run_chunks(
+            run, test_data, predictor, show_progress, max_workers
+        )
+        if trace_path is None:
+            chunk_counters = results
+        else:
+            chunk_counters = [counters for counters, _ in results]
+            traces = [columns for _, columns in results]
+        if output_path is not None:
+            for i, counters in enumerate(chunk_counters):
+                chunk_metrics = {**metrics, "chunk": i, **counters}
+                add_hit_rate(chunk_metrics)
+                utils.save_metrics("simulate_chunks.csv", output_path, chunk_metrics)
+        counters = chunks.merge_counters(chunk_counters)
+    else:
+        test_data = test_data.reshape((test_data.shape[0] * test_data.shape[1]))
+        _logger.debug(f"test data shape: {test_data.shape}")
+        counters = run(test_data, predictor, show_progress=show_progress)
+        if trace_path is not None:
+            counters, columns = counters
+            traces = [columns]
+    metrics.update(counters)
+    add_hit_rate(metrics)
+
+    if trace_path is not None:
+        trace.save_trace(trace_path, traces)
+
+    # save metrics
+    if output_path is not None:
+        utils.save_metrics("simulate.csv", output_path, metrics)
+    return metrics
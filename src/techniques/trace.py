@@ -0,0 +1,82 @@
+from .. import logger
+from ..window import WindowConfig
+from os.path import join
+import os
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+
+def get_trace_path(
+    traces_path: str,
+    technique: str,
+    dataset_name: str,
+    predictor_name: str,
+    window_config: WindowConfig,
+    seed: int,
+    error: int,
+    realign: str,
+    alpha: float,
+) -> str:
+    """
+    Returns the path of the trace of a simulation, following the layout of the models.
+
+    Parameters:
+        traces_path (str): Base path where traces are stored.
+        technique (str): Name of the technique.
+        dataset_name (str): Name of the simulated dataset.
+        predictor_name (str): Name of the predictor.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used to split the dataset.
+        error (int): Allowed relative error (percentage).
+        realign (str): Realignment strategy.
+        alpha (float): Scaling factor of the realignment strategy.
+
+    Returns:
+        str: A full trace path, with the `.npz` extension.
+    """
+    return join(
+        traces_path,
+        dataset_name,
+        f"{seed}",
+        f"ws{window_config.ws}_ts{window_config.ts}",
+        f"{technique}_{predictor_name}_{realign}_a{alpha}_e{error}.npz",
+    )
+
+
+def save_trace(trace_path: str, traces: list[dict]):
+    """
+    Saves the traces of the simulated streams to a compressed `.npz` file, readable with numpy
+    alone (Parquet would need pyarrow, which is not a dependency).
+
+    The traces are concatenated, with a 'chunk' column holding the position of the
+    stream of each step (always 0 when the test data is simulated as a single stream).
+
+    Parameters:
+        trace_path (str): Path of the output file.
+        traces (list[dict]): Trace of each stream, as returned by `StepCounters.columns`.
+    """
+    columns = {
+        key: np.concatenate([trace[key] for trace in traces]) for key in traces[0]
+    }
+    columns["chunk"] = np.repeat(
+        np.arange(len(traces)), [trace["index"].shape[0] for trace in traces]
+    )
+
+    _logger.debug(f"write trace in '{trace_path}'")
+    os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+    np.savez_compressed(trace_path, **columns)
+
+
+def load_trace(trace_path: str) -> dict:
+    """
+    Loads a trace saved by `save_trace`.
+
+    Parameters:
+        trace_path (str): Path of the trace file.
+
+    Returns:
+        dict: The columns of the trace, see `StepCounters.columns`, plus 'chunk'.
+    """
+    with np.load(trace_path) as data:
+        return {key: data[key] for key in data.files}
@@ -0,0 +1,172 @@
+from . import logger
+from .dataset import Dataset, to_supervised
+from .ml_model import get_model_path
+from .model_cache import ModelCache, get_default_cache
+from .window import WindowConfig
+import numpy as np
+
+_logger = logger.get_logger(__name__)
+
+QUANTIZATIONS = ["float32", "float16", "int8"]
+
+
+def get_tflite_model_path(
+    model_name: str,
+    model_path: str,
+    dataset_name: str,
+    window_config: WindowConfig,
+    seed: int,
+    quantization: str,
+) -> str:
+    """
+    Returns the path of the TFLite export of a model, stored next to the Keras model.
+
+    Parameters:
+        model_name (str): Name of the model architecture.
+        model_path (str): Base path where models are stored.
+        dataset_name (str): Name of the dataset used for training.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used for reproducibility.
+        quantization (str): Quantization of the model, one of `QUANTIZATIONS`.
+
+    Returns:
+        str: The path of the `.tflite` file.
+    """
+    return (
+        get_model_path(model_name, model_path, dataset_name, window_config, seed)
+        + f"_{quantization}.tflite"
+    )
+
+
+def representative_windows(
+    dataset: Dataset, window_config: WindowConfig, seed: int, samples: int = 200
+) -> np.ndarray:
+    """
+    Draws a random subset of the training windows, used to calibrate the int8 quantization.
+
+    Parameters:
+        dataset (Dataset): Dataset the model was trained on.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used to split the dataset and to draw the windows.
+        samples (int, optional): Number of windows to draw. Default is 200.
+
+    Returns:
+        np.ndarray: The windows as a 3-D array with shape (samples, ws, 1).
+    """
+    train_data, _ = dataset.train_test_split(type="random", seed=seed)
+    train_data = train_data.reshape((train_data.shape[0] * train_data.shape[1], 1))
+    x_train, _ = to_supervised(train_data, window_config)
+
+    rng = np.random.default_rng(seed)
+    idx = rng.choice(
+        x_train.shape[0], size=min(samples, x_train.shape[0]), replace=False
+    )
+    return x_train[idx].astype(np.float32)
+
+
+def convert_to_tflite(
+    model,
+    window_config: WindowConfig,
+    quantization: str,
+    representative_data: np.ndarray = None,
+) -> bytes:
+    """
+    Converts a Keras model to TFLite with a fixed (1, ws, 1) input.
+
+    Parameters:
+        model (keras.Model): The Keras model to convert.
+        window_config (WindowConfig): Window configuration parameters.
+        quantization (str): One of `QUANTIZATIONS`:
+            - 'float32': no quantization.
+            - 'float16': weights stored as float16.
+            - 'int8': post-training integer quantization calibrated on `representative_data`.
+              Operations without an int8 kernel fall back to float, inputs and outputs stay float32.
+        representative_data (np.ndarray, optional): Windows with shape (N, ws, 1), required for 'int8'.
+
+    Returns:
+        bytes: The serialized TFLite model.
+
+    Raises:
+        Exception: If the quantization is unknown or the representative data is missing.
+    """
+    import tensorflow as tf
+
+    serving_fn = tf.function(lambda x: model(x, training=False))
+    concrete_fn = serving_fn.get_concrete_function(
+        tf.TensorSpec((1, window_config.ws, 1), tf.float32)
+    )
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [concrete_fn], serving_fn
+    )
+
+    match quantization:
+        case "float32":
+            pass
+        case "float16":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        case "int8":
+            if representative_data is None:
+                _logger.fatal("int8 quantization requires representative data")
+                raise Exception("int8 quantization requires representative data")
+
+            def representative_dataset():
+                for window in representative_data:
+                    yield [window.reshape((1, window_config.ws, 1)).astype(np.float32)]
+
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+                tf.lite.OpsSet.TFLITE_BUILTINS,
+            ]
+        case _:
+            _logger.fatal(f"unknown quantization '{quantization}'")
+            raise Exception(f"unknown quantization '{quantization}'")
+
+    return converter.convert()
+
+
+def export_tflite_model(
+    model_name: str,
+    models_path: str,
+    dataset: Dataset,
+    window_config: WindowConfig,
+    seed: int,
+    quantization: str,
+    cache: ModelCache = None,
+) -> str:
+    """
+    Exports a trained Keras model into a TFLite model stored next to it.
+
+    Parameters:
+        model_name (str): Name of the model architecture.
+        models_path (str): Base path where models are stored.
+        dataset (Dataset): Dataset the model was trained on, used to calibrate the int8 quantization.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed used for reproducibility.
+        quantization (str): Quantization of the model, one of `QUANTIZATIONS`.
+        cache (ModelCache, optional): Cache used to load the Keras model. Default is the process-wide cache.
+
+    Returns:
+        str: The path of the exported model.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    model_path = get_model_path(
+        model_name, models_path, dataset.name(), window_config, seed
+    )
+    out_path = get_tflite_model_path(
+        model_name, models_path, dataset.name(), window_config, seed, quantization
+    )
+
+    representative_data = None
+    if quantization == "int8":
+        representative_data = representative_windows(dataset, window_config, seed)
+
+    _logger.debug(f"export model '{model_path}' into '{out_path}'")
+    tflite_model = convert_to_tflite(
+        cache.get(model_path), window_config, quantization, representative_data
+    )
+    with open(out_path, "wb") as f:
+        f.write(tflite_model)
+    return out_path
@@ -3,6 +3,7 @@ from . import logger
 from .dataset import Dataset, to_supervised
 from .window import WindowConfig
 from . import ml_model
+from .model_cache import get_default_cache
 from sklearn.model_selection import train_test_split
 from tensorflow import keras
 
@@ -145,3 +146,163 @@ def train_models(
         )
         scores[model_name] = score
     _logger.debug(f"training scores= {scores}")
+
+
+def _distill_model(
+    dataset: Dataset,
+    teacher_name: str,
+    student_name: str,
+    model_path: str,
+    model_param: dict,
+    output_path: str,
+    window_config: WindowConfig,
+    seed: int,
+    alpha: float = 1.0,
+    optimizer: str = "adam",
+    loss: str = "mse",
+    metrics: list[str] = ["mean_absolute_error", "mean_absolute_percentage_error"],
+):
+    """
+    Train a small student model on the outputs of an already trained teacher model.
+
+    The teacher is loaded from the models directory, its predictions over the training
+    windows become the targets of the student, and the student is saved through the same
+    layout used by `_train_model`, so it can be loaded by `MLPredictor` as any other model.
+
+    Parameters:
+        dataset (Dataset): The dataset to train on.
+        teacher_name (str): Identifier of the trained teacher model (e.g. 'model3').
+        student_name (str): Identifier of the student model to be trained (e.g. 'student_dense').
+        model_path (str): Path where the teacher is stored and the student will be saved.
+        model_param (dict): Dictionary containing student-specific parameters.
+        output_path (str): Path where training metrics will be written.
+        window_config (WindowConfig): Window configuration parameters.
+        seed (int): Random seed for reproducibility.
+        alpha (float, optional): Weight of the teacher outputs in the targets, the rest is given to the real values. Defaults to 1.0.
+        optimizer (str, optional): Optimizer to use during training. Defaults to "adam".
+        loss (str, optional): Loss function. Defaults to "mse".
+        metrics (list, optional): List of metrics for model evaluation. Defaults to MAE and MAPE.
+    """
+    assert "epochs" in model_param
+    assert "batch_size" in model_param
+    assert 0.0 <= alpha <= 1.0
+
+    _logger.debug(f"distill model '{teacher_name}' into '{student_name}' with:")
+    _logger.debug(f"  {seed          = }")
+    _logger.debug(f"  {window_config = }")
+    _logger.debug(f"  {model_param   = }")
+    _logger.debug(f"  {alpha         = }")
+
+    # set seed for training
+    utils.set_seed(seed)
+
+    # split dataset and convert it to supervised
+    train_data, _ = dataset.train_test_split(type="random", seed=seed)
+    train_data = train_data.reshape((train_data.shape[0] * train_data.shape[1], 1))
+    train_sup_x, train_sup_y = to_supervised(train_data, window_config)
+
+    # split data into training and testing sets
+    x_train, x_test, y_train, y_test = train_test_split(
+        train_sup_x, train_sup_y, random_state=seed, shuffle=True, train_size=0.80
+    )
+
+    # compute the soft targets with the teacher
+    teacher_path = ml_model.get_model_path(
+        teacher_name, model_path, dataset.name(), window_config, seed
+    )
+    _logger.debug(f"load teacher from '{teacher_path}'")
+    teacher = get_default_cache().get(teacher_path)
+    y_teacher = teacher.predict(x_train, batch_size=1024, verbose=0).reshape(
+        y_train.shape
+    )
+    y_target = alpha * y_teacher + (1.0 - alpha) * y_train
+
+    # load the model
+    student_path = ml_model.get_model_path(
+        student_name, model_path, dataset.name(), window_config, seed
+    )
+    _logger.debug(f"store model into '{student_path}'")
+    model_save_cb = keras.callbacks.ModelCheckpoint(student_path, save_best_only=True)
+
+    # build the model
+    model = ml_model.build_model(student_name, model_param, window_config, x_train)
+    model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+
+    # train the model
+    model.fit(
+        x_train,
+        y_target,
+        validation_split=0.10,
+        epochs=model_param["epochs"],
+        callbacks=[model_save_cb],
+        batch_size=model_param["batch_size"],
+        verbose=2,
+    )
+
+    # evaluate the model against the real values
+    score = model.evaluate(x_test, y_test, verbose=0)
+
+    utils.save_metrics(
+        "distill.csv",
+        output_path,
+        {
+            "dataset": dataset.name(),
+            "seed": seed,
+            "teacher": teacher_name,
+            "model": student_name,
+            "window_size": window_config.ws,
+            "time_steps": window_config.ts,
+            "alpha": alpha,
+            "param": model_param,
+            "score": score,
+        },
+    )
+    return score
+
+
+def distill_models(
+    dataset: Dataset,
+    window_config: WindowConfig,
+    models_path: str,
+    output_path: str,
+    seed: int,
+    teacher_name: str,
+    params: dict,
+    alpha: float = 1.0,
+):
+    """
+    Distill a trained teacher model into multiple student models.
+
+    Parameters:
+        dataset (Dataset): The dataset to train on.
+        window_config (WindowConfig): Window configuration parameters.
+        models_path (str): Path where the teacher is stored and the students will be saved.
+        output_path (str): Path where training metrics will be written.
+        seed (int): Seed for reproducibility during training.
+        teacher_name (str): Identifier of the trained teacher model (e.g. 'model3').
+        params (dict): Dictionary where keys are student names and values are parameter dictionaries.
+        alpha (float, optional): Weight of the teacher outputs in the targets. Defaults to 1.0.
+    """
+    _logger.info(f"distill models using parameters:")
+    _logger.info(f"  dataset       = '{dataset.name()}'")
+    _logger.info(f"  teacher       = '{teacher_name}'")
+    _logger.info(f"  {window_config = }")
+    _logger.info(f"  {seed          = }")
+    _logger.info(f"  {alpha         = }")
+    _logger.debug(f" {params        = }")
+
+    scores = {}
+    for student_name, model_param in params.items():
+        score = _distill_model(
+            dataset,
+            teacher_name,
+            student_name,
+            models_path,
+            model_param,
+            output_path,
+            window_config,
+            seed,
+            alpha,
+        )
+        scores[student_name] = score
+    _logger.debug(f"distillation scores= {scores}")
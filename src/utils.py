@@ -1,10 +1,7 @@
 from . import logger
 import os
+import sys
 import csv
-from sklearn.metrics import (
-    mean_absolute_error,
-    mean_absolute_percentage_error,
-)
 
 _logger = logger.get_logger(__name__)
 
@@ -12,17 +9,24 @@ _logger = logger.get_logger(__name__)
 def set_seed(seed: int):
     """
     Set the seed for python, numpy and tensorflow.
+
+    TensorFlow is seeded only when it has already been imported (e.g. by `MLPredictor`),
+    so predictors that do not need it do not pay its import time.
     """
     # TODO: It is possibe that using imports inside the function will break when using a GPU.
     import os
 
     os.environ["TF_CUDNN_DETERMINISTIC"] = "1"
-    import tensorflow as tf
     import random
     import numpy as np
 
     random.seed(seed)
     np.random.seed(seed)
+    if "tensorflow" not in sys.modules:
+        return
+
+    import tensorflow as tf
+
     tf.random.set_seed(seed)
     tf.config.experimental.enable_op_determinism()
     if len(tf.config.list_physical_devices("GPU")) != 0:
@@ -71,6 +75,11 @@ def compute_metrics(real_values, pred_values):
     Returns:
         dict: Dictionary containing each computed metric organized by its name.
     """
+    from sklearn.metrics import (
+        mean_absolute_error,
+        mean_absolute_percentage_error,
+    )
+
     mae = mean_absolute_error(real_values, pred_values)
     mape = mean_absolute_percentage_error(real_values, pred_values)
     mapes = mean_absolute_percentage_error(
@@ -3,9 +3,9 @@ from . import logger
 from .dataset import Dataset, to_supervised
 from .window import WindowConfig
 from .predictors.predictor import BasePredictor
-from .predictors.ml_predictor import MLPredictor
 from .predictors.dbp_predictor import DBPPredictor
-from .predictors.kf_predictor import KFPredictor
+from .predictors.ensemble_predictor import EnsemblePredictor
+from .predictors.cached_predictor import add_hit_rate
 import numpy as np
 
 _logger = logger.get_logger(__name__)
@@ -34,26 +34,40 @@ def validate(
     _logger.info(f"  {window_config = }")
     _logger.info(f"  {seed          = }")
 
-    if isinstance(predictor, MLPredictor) or isinstance(predictor, DBPPredictor):
-        metrics = _validate_batch(dataset, predictor, window_config, seed)
-    elif isinstance(predictor, KFPredictor):
+    predictor_counters = predictor.counters()
+    if isinstance(predictor, EnsemblePredictor):
+        # one row for each member and one for the combined predictions
+        rows = _validate_ensemble(dataset, predictor, window_config, seed)
+    elif isinstance(predictor, DBPPredictor):
+        metrics = _validate_series(dataset, predictor, window_config, seed)
+        rows = [(predictor.name(), window_config.ws, metrics)]
+    elif predictor.get_state() is not None:
+        # stateful predictors must be primed with each window
         metrics = _validate_unrolled(dataset, predictor, window_config, seed)
+        rows = [(predictor.name(), window_config.ws, metrics)]
     else:
-        _logger.fatal(f"unknown predictor {predictor}")
-        raise Exception(f"unknown predictor {predictor}")
-
-    utils.save_metrics(
-        "validate.csv",
-        output_path,
-        {
-            "dataset": dataset.name(),
-            "predictor_name": predictor.name(),
-            "seed": seed,
-            "window_size": window_config.ws,
-            "time_steps": window_config.ts,
-            "metrics": metrics,
-        },
-    )
+        metrics = _validate_batch(dataset, predictor, window_config, seed)
+        rows = [(predictor.name(), window_config.ws, metrics)]
+
+    # counters collected by the predictor during the validation (e.g. cache hits)
+    for key, value in predictor.counters().items():
+        predictor_counters[key] = value - predictor_counters[key]
+    add_hit_rate(predictor_counters)
+    rows[-1][2].update(predictor_counters)
+
+    for predictor_name, window_size, metrics in rows:
+        utils.save_metrics(
+            "validate.csv",
+            output_path,
+            {
+                "dataset": dataset.name(),
+                "predictor_name": predictor_name,
+                "seed": seed,
+                "window_size": window_size,
+                "time_steps": window_config.ts,
+                "metrics": metrics,
+            },
+        )
 
 
 def _validate_batch(
@@ -77,6 +91,29 @@ def _validate_batch(
     return utils.compute_metrics(y_test, y_pred)
 
 
+def _validate_series(
+    dataset: Dataset,
+    predictor: DBPPredictor,
+    window_config: WindowConfig,
+    seed: int,
+):
+    # load validation data
+    _, test_data = dataset.train_test_split(type="random", seed=seed)
+    test_data = test_data.reshape(-1)
+
+    # targets of every window, as returned by `to_supervised`
+    y_test = np.lib.stride_tricks.sliding_window_view(
+        test_data[window_config.ws :], window_config.ts
+    )
+    _logger.debug(f"test data shapes: {test_data.shape = } { y_test.shape = }")
+
+    # predict the data of every window at once
+    y_pred = predictor.predict_series(test_data, window_config.ws)[: y_test.shape[0]]
+    _logger.debug(f"predicted data shape: {y_pred.shape = }")
+
+    return utils.compute_metrics(y_test, y_pred)
+
+
 def _validate_unrolled(
     dataset: Dataset,
     predictor: BasePredictor,
@@ -91,26 +128,36 @@ def _validate_unrolled(
     x_test, y_test = to_supervised(test_data, window_config)
     _logger.debug(f"test data shapes: {x_test.shape = } { y_test.shape = }")
 
-    y_pred = np.zeros(y_test.shape)
+    # prime the predictor with each window, starting from its initial state
+    y_pred = predictor.predict_unrolled(x_test)
+    _logger.debug(f"predicted data shape: {y_pred.shape = }")
 
-    for i in range(x_test.shape[0]):
-        # load a new model
-        if isinstance(predictor, KFPredictor):
-            kf_predictor = KFPredictor(x_size=predictor.x_size)
-        else:
-            _logger.fatal(
-                f"expected an object of KFPredictor class but got {predictor.__class__.__name__}"
-            )
-            raise Exception(
-                f"expected an object of KFPredictor class but got {predictor.__class__.__name__}"
-            )
+    return utils.compute_metrics(y_test, y_pred)
 
-        # initialize the model with the data on the buffer
-        for val in x_test[i]:
-            kf_predictor.predict(x_test[i])
-            kf_predictor.update(val)
 
-        # predict next value
-        y_pred[i] = kf_predictor.predict(x_test[i])
+def _validate_ensemble(
+    dataset: Dataset,
+    predictor: EnsemblePredictor,
+    window_config: WindowConfig,
+    seed: int,
+):
+    utils.set_seed(seed)
 
-    return utils.compute_metrics(y_test, y_pred)
+    # load validation data and convert it to supervised
+    _, test_data = dataset.train_test_split(type="random", seed=seed)
+    test_data = test_data.reshape((test_data.shape[0] * test_data.shape[1], 1))
+    x_test, y_test = to_supervised(test_data, window_config)
+    _logger.debug(f"test data shapes: {x_test.shape = } { y_test.shape = }")
+
+    # predict the data with all the members at once, every member sees the same targets
+    predictor.reset()
+    member_preds, y_pred = predictor.predict_all(x_test)
+    _logger.debug(f"predicted data shapes: {member_preds.shape = } {y_pred.shape = }")
+
+    rows = []
+    for (name, ws), preds in zip(predictor.members(), member_preds):
+        rows.append((name, ws, utils.compute_metrics(y_test, preds)))
+    rows.append(
+        (predictor.name(), window_config.ws, utils.compute_metrics(y_test, y_pred))
+    )
+    return rows
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import numpy as np
 
 
 @dataclass
@@ -13,3 +14,111 @@ class WindowConfig:
 
     ws: int
     ts: int = 1
+
+
+class RingWindow:
+    """
+    Preallocated sliding window of one or more streams, updated without allocations.
+
+    Values are stored twice in a circular buffer of length 2 * ws (mirror trick), so the
+    last `ws` values are always available as a contiguous slice of the buffer and pushing
+    a value writes two elements instead of shifting the whole window.
+    """
+
+    def __init__(self, ws: int, streams: int = 1, dtype=np.float64):
+        """
+        Initializes a window filled with zeros.
+
+        Parameters:
+            ws (int): Size of the window.
+            streams (int, optional): Number of independent streams sharing the buffer. Default is 1.
+            dtype (optional): Type of the stored values. Default is float64.
+        """
+        assert ws > 0
+        assert streams > 0
+
+        self._ws = ws
+        self._data = np.zeros((streams, 2 * ws, 1), dtype=dtype)
+        self._start = 0
+        self._index = np.arange(ws)
+
+        # positions of the buffer as rows, indexing a row is faster than slicing the buffer
+        self._positions = self._data[:, :, 0].T
+        # the window can start at ws positions only, so its views are created once
+        self._views = [self._data[:, i : i + ws] for i in range(ws)]
+
+    def view(self) -> np.ndarray:
+        """
+        Returns the window as a view with shape (streams, ws, 1), ordered from the oldest value.
+
+        The view is invalidated by the next update of the window.
+        """
+        return self._views[self._start]
+
+    def first(self) -> np.ndarray:
+        """
+        Returns the oldest value of each stream, with shape (streams,).
+        """
+        return self._positions[self._start]
+
+    def last(self) -> np.ndarray:
+        """
+        Returns the newest value of each stream, with shape (streams,).
+        """
+        return self._positions[self._start + self._ws - 1]
+
+    def push(self, value):
+        """
+        Appends a value to each stream, dropping the oldest one.
+
+        Parameters:
+            value: The new value, a scalar or an array with one value for each stream.
+        """
+        self._positions[self._start] = value
+        self._positions[self._start + self._ws] = value
+        self._start += 1
+        if self._start == self._ws:
+            self._start = 0
+
+    def push_many(self, values: np.ndarray):
+        """
+        Appends many values to each stream, as many calls to `push`.
+
+        Parameters:
+            values (np.ndarray): The new values, with shape (n,) or (streams, n).
+        """
+        values = np.asarray(values)
+        n = values.shape[-1]
+        if n > self._ws:
+            values = values[..., -self._ws :]
+            n = self._ws
+
+        idx = self._index[:n] + self._start
+        idx[idx >= self._ws] -= self._ws
+        self._data[:, idx, 0] = values
+        self._data[:, idx + self._ws, 0] = values
+        self._start = (self._start + n) % self._ws
+
+    def fill(self, values: np.ndarray):
+        """
+        Replaces the whole window.
+
+        Parameters:
+            values (np.ndarray): The new window, with shape (ws,) or (streams, ws).
+        """
+        self._data[:, : self._ws, 0] = values
+        self._data[:, self._ws :, 0] = values
+        self._start = 0
+
+    def fill_linear(self, p1, p2):
+        """
+        Replaces the whole window with the values on the line from `p1` (oldest) to `p2` (newest).
+
+        Parameters:
+            p1: Value of the oldest element, a scalar or an array with one value for each stream.
+            p2: Value of the newest element, a scalar or an array with one value for each stream.
+        """
+        p1 = np.asarray(p1, dtype=self._data.dtype).reshape((-1, 1))
+        p2 = np.asarray(p2, dtype=self._data.dtype).reshape((-1, 1))
+        omega = (p2 - p1) / (self._ws - 1)
+        self.fill(p1 + self._index * omega)
@@ -7,9 +7,7 @@ from src.dataset_loader import (
 )
 from src.window import WindowConfig
 from src.validate import validate
-from src.predictors.ml_predictor import MLPredictor
-from src.predictors.dbp_predictor import DBPPredictor
-from src.predictors.kf_predictor import KFPredictor
+from src.predictors.registry import create_predictor
 
 DATASET_DIR = "/home/l.calisti/notebooks/dlds_paper/datasets"
 MODELS_DIR = "/home/l.calisti/notebooks/dlds_paper/models"
@@ -43,8 +41,8 @@ for dataset_name, dataset_loader in DATASET_NAMES:
             for ts in TS:
                 for model_name in MODELS:
                     wc = WindowConfig(ws, ts)
-                    ml_predictor = MLPredictor(
-                        model_name, MODELS_DIR, ds.name(), wc, seed
+                    ml_predictor = create_predictor(
+                        "ml", model_name, MODELS_DIR, ds.name(), wc, seed
                     )
                     validate(
                         dataset=ds,
@@ -53,7 +51,7 @@ for dataset_name, dataset_loader in DATASET_NAMES:
                         seed=seed,
                         output_path=OUTPUT_DIR,
                     )
-                    # dbp_predictor = DBPPredictor(20)
+                    # dbp_predictor = create_predictor("dbp", 20)
                     # validate(
                     #     dataset=ds,
                     #     predictor=dbp_predictor,
@@ -61,7 +59,7 @@ for dataset_name, dataset_loader in DATASET_NAMES:
                     #     seed=seed,
                     #     output_path=OUTPUT_DIR,
                     # )
-                    # kf_predictor = KFPredictor(x_size=3)
+                    # kf_predictor = create_predictor("kf", x_size=3)
                     # validate(
                     #     dataset=ds,
                     #     predictor=kf_predictor,
@@ -69,3 +67,58 @@ for dataset_name, dataset_loader in DATASET_NAMES:
                     #     seed=seed,
                     #     output_path=OUTPUT_DIR,
                     # )
+                    # ensemble = create_predictor(
+                    #     "ensemble",
+                    #     [(ml_predictor, ws), (dbp_predictor, 20), (kf_predictor, 3)],
+                    #     combine="best",
+                    # )
+                    # validate(
+                    #     dataset=ds,
+                    #     predictor=ensemble,
+                    #     window_config=WindowConfig(ensemble.window_size(), ts),
+                    #     seed=seed,
+                    #     output_path=OUTPUT_DIR,
+                    # )
+                    # ar_predictor = create_predictor("ar", wc).fit_dataset(ds, seed)
+                    # validate(
+                    #     dataset=ds,
+                    #     predictor=ar_predictor,
+                    #     window_config=wc,
+                    #     seed=seed,
+                    #     output_path=OUTPUT_DIR,
+                    # )
+                    # knn_predictor = create_predictor("knn", wc).fit_or_load(
+                    #     MODELS_DIR, ds, seed
+                    # )
+                    # validate(
+                    #     dataset=ds,
+                    #     predictor=knn_predictor,
+                    #     window_config=wc,
+                    #     seed=seed,
+                    #     output_path=OUTPUT_DIR,
+                    # )
+                    # one-step model forecasting ts values recursively
+                    # rec_predictor = create_predictor(
+                    #     "recursive",
+                    #     create_predictor("ml", model_name, MODELS_DIR, ds.name(), WindowConfig(ws, 1), seed),
+                    #     ts,
+                    # )
+                    # validate(
+                    #     dataset=ds,
+                    #     predictor=rec_predictor,
+                    #     window_config=wc,
+                    #     seed=seed,
+                    #     output_path=OUTPUT_DIR,
+                    # )
+                    # predictions of nearly identical windows served from a cache,
+                    # the hit rate is saved with the metrics
+                    # cached_predictor = create_predictor(
+                    #     "cached", ml_predictor, resolution=1.0
+                    # )
+                    # validate(
+                    #     dataset=ds,
+                    #     predictor=cached_predictor,
+                    #     window_config=wc,
+                    #     seed=seed,
+                    #     output_path=OUTPUT_DIR,
+                    # )